@@ -1,8 +1,10 @@
 from django.contrib import admin, messages
+from django.utils.html import format_html, format_html_join
 from django.core.exceptions import ValidationError
 from django.db.models.deletion import ProtectedError
-from django_enterprise_maintenance_suite.models import MaintenanceState, MaintenanceAuditLog, MaintenanceIgnoreURL
+from django_enterprise_maintenance_suite.models import MaintenanceState, MaintenanceAuditLog, MaintenanceIgnoreURL, DeferredRequest
 from django_enterprise_maintenance_suite.services.maintenance import MaintenanceService, InvalidTransitionError 
+from django_enterprise_maintenance_suite.services.shadow import shadow_report
 
 # Helper to create logs
 def create_audit_log(user, action, window_obj, changes=None, ip=None):
@@ -41,11 +43,25 @@ class MaintenanceAuditLogAdmin(admin.ModelAdmin):
             
         return "Deleted Window (No Snapshot)"
 
+@admin.register(DeferredRequest)
+class DeferredRequestAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'method', 'path', 'status', 'response_status', 'replayed_at')
+    list_filter = ('status', 'method')
+    readonly_fields = ('created_at', 'maintenance_window', 'method', 'path', 'query_string', 'status', 'response_status', 'replayed_at')
+    exclude = ('headers', 'body')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 @admin.register(MaintenanceState)
 class MaintenanceStateAdmin(admin.ModelAdmin):
     list_display = (
         'mode',
         'is_enabled',
+        'is_shadow',
         'start_time',
         'end_time',
         'created_by',
@@ -53,10 +69,34 @@ class MaintenanceStateAdmin(admin.ModelAdmin):
     )
 
     inlines = [MaintenanceIgnoreURLInline]
-    list_filter = ('mode', 'status', 'is_enabled', 'approved_by')
+    list_filter = ('mode', 'status', 'is_enabled', 'is_shadow', 'approved_by')
     search_fields = ('mode', 'created_by__username', 'reason')
 
-    readonly_fields = ('created_at', 'created_by', 'approved_by', 'status')
+    readonly_fields = ('created_at', 'created_by', 'approved_by', 'status', 'shadow_results')
+
+    def get_readonly_fields(self, request, obj=None):
+        readonly = super().get_readonly_fields(request, obj)
+        # Once approved, rollout changes go through MaintenanceService (audited)
+        if obj and obj.status == MaintenanceState.Status.APPROVED:
+            readonly = readonly + ('rollout_percentage', 'rollout_key', 'rollout_header')
+        return readonly
+
+    @admin.display(description="Shadow results (would-block counts)")
+    def shadow_results(self, obj):
+        if not obj or not obj.pk or not obj.is_shadow:
+            return "-"
+        report = shadow_report(obj)
+        rows = format_html_join(
+            "",
+            "<tr><td>{}</td><td>{}</td></tr>",
+            [(row['path_prefix'], row['count']) for row in report['by_prefix']]
+            + [(row['method'], row['count']) for row in report['by_method']],
+        )
+        return format_html(
+            "<p>~{} request(s) would have been blocked.</p><table>{}</table>",
+            report['total'],
+            rows,
+        )
 
     def get_actions(self, request):
         actions = super().get_actions(request)
@@ -6,3 +6,8 @@ class EnterpriseMaintenanceSuitConfig(AppConfig):
 
     def ready(self):
         import django_enterprise_maintenance_suite.signals
+        from django_enterprise_maintenance_suite.warmup import validate_settings, load_backend_class
+
+        # Fail fast on a broken configuration; DB work waits for the middleware
+        validate_settings()
+        load_backend_class()
@@ -1,9 +1,13 @@
+import hashlib
 import re
+import zlib
 from django.conf import settings
 from django.urls import reverse, NoReverseMatch
 from django.core.cache import cache
 from django.utils import timezone
-from django_enterprise_maintenance_suite.models import MaintenanceState, MAINTENANCE_CACHE_KEY
+from django.utils.crypto import constant_time_compare
+from django_enterprise_maintenance_suite.policy import ReadOnlyPolicy, DEFAULT_ALLOWED_METHODS
+from django_enterprise_maintenance_suite.models import MaintenanceState, MAINTENANCE_CACHE_KEY, MAINTENANCE_CACHE_TIMEOUT
 
 class DefaultMaintenanceBackend:
     def __init__(self):
@@ -12,33 +16,48 @@ class DefaultMaintenanceBackend:
             re.compile(p.lstrip('/')) 
             for p in self.conf.get('IGNORE_URL_PATTERNS', [])
         ]
+        self.defer_patterns = [
+            re.compile(p.lstrip('/'))
+            for p in self.conf.get('READ_ONLY_DEFER_URL_PATTERNS', [])
+        ]
+        self.bypass_superuser = self.conf.get('BYPASS_SUPERUSER', False)
+        self.bypass_staff = self.conf.get('BYPASS_STAFF', False)
+        self.bypass_groups = frozenset(self.conf.get('BYPASS_GROUPS', []))
+        self.bypass_token = self.conf.get('BYPASS_TOKEN')
+        self.bypass_cookie_name = self.conf.get('BYPASS_COOKIE_NAME', 'maintenance_bypass')
+        self.bypass_cookie_age = self.conf.get('BYPASS_COOKIE_AGE', 3600)
+        self._internal_paths = None
+        self._policy = None
+        self._exemptions = None
+
+    def warm_up(self):
+        """
+        Does the per-process work up front instead of on the first request:
+        resolves the internal URLs, preloads the state snapshot and compiles
+        its URL exceptions and read-only policy.
+        """
+        self._resolve_internal_paths()
+        current_state = self._get_state()
+        if current_state:
+            self.get_exemptions(current_state)
+            self.get_policy(current_state)
 
     def get_maintenance_window(self, request):
         """
         Determines if there is an active maintenance window for this request.
         Returns the MaintenanceState object or None.
+        Requests a window would never refuse are flagged with
+        request.maintenance_exempt so they are not counted as in-flight work.
         """
-        # 1. Global Ignores (Static/Health)
-        path = request.path_info.lstrip('/')
-        for pattern in self.global_ignore_patterns:
-            if pattern.match(path):
-                return None
-
-        # 2. Admin & Status API Check
-        if self._is_admin_or_status(request):
+        # 1-2. Global Ignores (Static/Health), Admin & Status API
+        if self.is_exempt(request):
+            request.maintenance_exempt = True
             return None
 
+        path = request.path_info.lstrip('/')
+
         # 3. Fetch State (Cache -> DB)
-        current_state = cache.get(MAINTENANCE_CACHE_KEY)
-        if current_state is None:
-            try:
-                current_state = MaintenanceState.objects.filter(
-                    is_enabled=True,
-                    status=MaintenanceState.Status.APPROVED
-                ).order_by('-created_at').prefetch_related('exceptions').first()
-                cache.set(MAINTENANCE_CACHE_KEY, current_state, timeout=3600)
-            except Exception:
-                return None
+        current_state = self._get_state()
 
         if not current_state:
             return None
@@ -51,29 +70,191 @@ class DefaultMaintenanceBackend:
             return None
 
         # 5. Per-Window URL Exceptions
-        for exception in current_state.exceptions.all():
-            if re.match(exception.pattern.lstrip('/'), path):
+        for pattern in self.get_exemptions(current_state):
+            if pattern.match(path):
+                request.maintenance_exempt = True
                 return None
 
+        # 6. Percentage Rollout (consistent hash cohort)
+        if current_state.rollout_percentage < 100 and not self.in_rollout(request, current_state):
+            request.maintenance_exempt = True
+            return None
+
         return current_state
 
-    def is_write_method(self, request):
+    def in_rollout(self, request, state):
         """
-        Decides if a request is considered a 'Write' operation.
-        Customizable via settings.
+        Stable cohort decision: the same client lands in the same bucket for
+        the lifetime of the window, so raising the percentage only adds clients.
         """
-        allowed_methods = self.conf.get('READ_ONLY_ALLOWED_METHODS', ['GET', 'HEAD', 'OPTIONS'])
-        return request.method not in allowed_methods
+        if state.rollout_percentage <= 0:
+            return False
+        key = self._rollout_key(request, state)
+        # The window id seeds the hash so each window picks its own cohorts
+        bucket = zlib.crc32(key.encode(), state.pk or 0) % 10000
+        return bucket < state.rollout_percentage * 100
 
-    def _is_admin_or_status(self, request):
-        """Helper to identify internal safe URLs"""
-        admin_url_name = self.conf.get('ADMIN_URL_NAME', 'admin:index')
-        try:
-            admin_path = reverse(admin_url_name)
-            if request.path.startswith(admin_path):
+    def _rollout_key(self, request, state):
+        RolloutKey = MaintenanceState.RolloutKey
+        key = None
+        if state.rollout_key == RolloutKey.SESSION:
+            key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        elif state.rollout_key == RolloutKey.USER:
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                key = str(user.pk)
+        elif state.rollout_key == RolloutKey.HEADER:
+            key = request.headers.get(state.rollout_header)
+        # Clients without the chosen key fall back to their IP
+        return key or request.META.get('REMOTE_ADDR', '')
+
+    def is_exempt(self, request):
+        """
+        Static exemptions: global ignore patterns plus the admin and status
+        URLs. Needs no I/O, so it is safe to call from async code.
+        """
+        path = request.path_info.lstrip('/')
+        for pattern in self.global_ignore_patterns:
+            if pattern.match(path):
                 return True
-            if request.path == reverse('maintenance_status'):
+        return self._is_admin_or_status(request)
+
+    def _get_state(self):
+        current_state = cache.get(MAINTENANCE_CACHE_KEY)
+        if current_state is None:
+            try:
+                current_state = MaintenanceState.objects.current_window()
+                if current_state:
+                    current_state.version
+                # False marks "no active window" so it is cached as a hit too.
+                # add() never overwrites: if a transition committed after our
+                # read, the on-commit primer's fresher snapshot wins.
+                cache.add(MAINTENANCE_CACHE_KEY, current_state or False, timeout=MAINTENANCE_CACHE_TIMEOUT)
+            except Exception:
+                return None
+        return current_state
+
+    def get_exemptions(self, state):
+        """Compiled per-window URL exceptions, rebuilt only when the window version changes."""
+        version = state.version
+        if self._exemptions is None or self._exemptions[0] != version:
+            patterns = [
+                re.compile(exception.pattern.lstrip('/'))
+                for exception in state.exceptions.all()
+            ]
+            self._exemptions = (version, patterns)
+        return self._exemptions[1]
+
+    def is_write_method(self, request, state=None):
+        """
+        Decides if a request is considered a 'Write' operation.
+        Customizable via settings (READ_ONLY_ALLOWED_METHODS, READ_ONLY_POLICY)
+        and the window's own read_only_rules.
+        """
+        return self.get_policy(state).is_write(request)
+
+    def get_policy(self, state=None):
+        """Compiled read-only policy, rebuilt only when the window version changes."""
+        version = state.version if state else None
+        if self._policy is None or self._policy[0] != version:
+            rules = list(self.conf.get('READ_ONLY_POLICY', []))
+            if state:
+                rules.extend(state.read_only_rules)
+            policy = ReadOnlyPolicy(
+                self.conf.get('READ_ONLY_ALLOWED_METHODS', DEFAULT_ALLOWED_METHODS),
+                rules,
+            )
+            self._policy = (version, policy)
+        return self._policy[1]
+
+    def is_deferrable(self, request):
+        """
+        Decides if a blocked write may be spooled and replayed later.
+        Only idempotent endpoints (e.g. webhook receivers) should be listed.
+        """
+        path = request.path_info.lstrip('/')
+        return any(pattern.match(path) for pattern in self.defer_patterns)
+
+    def has_bypass_cookie(self, request, state):
+        """
+        Checks the signed cookie left by an earlier bypass decision.
+        The cookie is scoped to the window version and to the requester's
+        session (or IP without one), so it stops working as soon as the
+        window changes and cannot be replayed by another client.
+        """
+        if self.bypass_cookie_name not in request.COOKIES:
+            return False
+        value = request.get_signed_cookie(
+            self.bypass_cookie_name,
+            default=None,
+            salt=self.bypass_cookie_name,
+            max_age=self.bypass_cookie_age,
+        )
+        return value is not None and constant_time_compare(value, self._bypass_value(request, state))
+
+    def is_bypassed(self, request, state):
+        """
+        Decides if the requester may browse normally during the window.
+        Customizable via settings (BYPASS_SUPERUSER, BYPASS_STAFF,
+        BYPASS_GROUPS, BYPASS_TOKEN).
+        """
+        if self.bypass_token:
+            token = request.GET.get(self.bypass_cookie_name) or request.headers.get('X-Maintenance-Bypass')
+            if token and constant_time_compare(token, self.bypass_token):
                 return True
+
+        if not (self.bypass_superuser or self.bypass_staff or self.bypass_groups):
+            return False
+
+        # Without a session cookie the user is anonymous; don't touch request.user
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+            return False
+
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return False
+        if self.bypass_superuser and user.is_superuser:
+            return True
+        if self.bypass_staff and user.is_staff:
+            return True
+        if self.bypass_groups:
+            return user.groups.filter(name__in=self.bypass_groups).exists()
+        return False
+
+    def set_bypass_cookie(self, request, response, state):
+        """Caches a positive bypass decision for the current window version."""
+        response.set_signed_cookie(
+            self.bypass_cookie_name,
+            self._bypass_value(request, state),
+            salt=self.bypass_cookie_name,
+            max_age=self.bypass_cookie_age,
+            secure=request.is_secure(),
+            httponly=True,
+            samesite='Lax',
+        )
+
+    def _bypass_value(self, request, state):
+        # A digest of the session key keeps the key itself out of the cookie
+        identity = request.COOKIES.get(settings.SESSION_COOKIE_NAME) or request.META.get('REMOTE_ADDR', '')
+        return f"{state.version}:{hashlib.sha256(identity.encode()).hexdigest()[:16]}"
+
+    def _resolve_internal_paths(self):
+        """Reverses the admin, status and report URLs once per process."""
+        admin_prefix = None
+        exact_paths = set()
+        try:
+            admin_prefix = reverse(self.conf.get('ADMIN_URL_NAME', 'admin:index'))
+            exact_paths.add(reverse('maintenance_status'))
+            exact_paths.add(reverse('maintenance_status_feed'))
+            exact_paths.add(reverse('maintenance_report'))
         except NoReverseMatch:
             pass
-        return False
\ No newline at end of file
+        self._internal_paths = (admin_prefix, frozenset(exact_paths))
+        return self._internal_paths
+
+    def _is_admin_or_status(self, request):
+        """Helper to identify internal safe URLs"""
+        admin_prefix, exact_paths = self._internal_paths or self._resolve_internal_paths()
+        if admin_prefix and request.path.startswith(admin_prefix):
+            return True
+        return request.path in exact_paths
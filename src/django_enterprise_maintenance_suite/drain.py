@@ -0,0 +1,156 @@
+import logging
+import os
+import threading
+import time
+from datetime import timedelta
+from django.core.cache import cache
+from django.utils import timezone
+from django_enterprise_maintenance_suite.warmup import get_setting
+
+MAINTENANCE_INFLIGHT_SLOTS_KEY = "maintenance_inflight_slots"
+MAINTENANCE_INFLIGHT_KEY_PREFIX = "maintenance_inflight"
+
+logger = logging.getLogger(__name__)
+
+
+def drain_start(state):
+    """
+    When the window took effect: the later of its scheduled start and the
+    moment it was enabled, so immediate windows and windows approved after
+    their start time drain as well.
+    """
+    moments = [m for m in (state.start_time, getattr(state, 'enabled_at', None)) if m]
+    return max(moments) if moments else None
+
+
+def drain_deadline(state):
+    """
+    Returns the moment the drain phase of a window ends, or None when the
+    window has no drain phase.
+    """
+    timeout = get_setting('DRAIN_TIMEOUT', 0)
+    start = drain_start(state)
+    if not timeout or start is None:
+        return None
+    if state.mode != state.Mode.MAINTENANCE or getattr(state, 'is_shadow', False):
+        return None
+    return start + timedelta(seconds=timeout)
+
+
+def is_drain_period(state, now=None):
+    deadline = drain_deadline(state)
+    if deadline is None:
+        return False
+    now = now or timezone.now()
+    return drain_start(state) <= now < deadline
+
+
+class InFlightCounter:
+    """
+    Per-process count of requests currently being served.
+    The count is only published to the shared registry while a drain is
+    in progress, so normal traffic never pays for a cache write. A watcher
+    thread notices a starting drain even when this process is busy with a
+    long request and sees no new traffic.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0
+        self._publish_until = 0.0
+        self._slot = None
+        self._watcher = None
+
+    @property
+    def value(self):
+        return self._value
+
+    @property
+    def key(self):
+        # Slots are handed out per process; a forked worker takes a new one
+        pid = os.getpid()
+        if self._slot is None or self._slot[0] != pid:
+            cache.add(MAINTENANCE_INFLIGHT_SLOTS_KEY, 0, timeout=None)
+            self._slot = (pid, cache.incr(MAINTENANCE_INFLIGHT_SLOTS_KEY))
+        return f"{MAINTENANCE_INFLIGHT_KEY_PREFIX}:{self._slot[1]}"
+
+    def increment(self):
+        with self._lock:
+            self._value += 1
+            value = self._value
+        if time.time() < self._publish_until:
+            self._publish(value)
+        elif self._watcher is None or not self._watcher.is_alive():
+            self._start_watcher()
+
+    def decrement(self):
+        with self._lock:
+            self._value -= 1
+            value = self._value
+        if time.time() < self._publish_until:
+            self._publish(value)
+
+    def watch(self, deadline):
+        """Start publishing this process' count until the drain deadline."""
+        until = deadline.timestamp()
+        if until <= self._publish_until:
+            return
+        self._publish_until = until
+        self._publish(self._value)
+
+    def _publish(self, value):
+        timeout = max(int(self._publish_until - time.time()), 0) + get_setting('DRAIN_TIMEOUT', 0)
+        try:
+            cache.set(self.key, value, timeout=timeout)
+        except Exception:
+            logger.exception("Could not publish in-flight request count")
+
+    def _start_watcher(self):
+        if not get_setting('DRAIN_TIMEOUT', 0):
+            return
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._watcher = threading.Thread(
+                target=self._watch_state, name="maintenance-drain", daemon=True
+            )
+            self._watcher.start()
+
+    def _watch_state(self):
+        # Only looks at the cached state while this process has work in flight
+        interval = get_setting('DRAIN_POLL_INTERVAL', 1)
+        while True:
+            time.sleep(interval)
+            if not self._value or time.time() < self._publish_until:
+                continue
+            try:
+                from django_enterprise_maintenance_suite.models import MAINTENANCE_CACHE_KEY
+
+                state = cache.get(MAINTENANCE_CACHE_KEY)
+                if state and is_drain_period(state):
+                    self.watch(drain_deadline(state))
+            except Exception:
+                logger.exception("Could not check for a starting drain")
+
+
+counter = InFlightCounter()
+
+
+def in_flight_total():
+    """Sum of the in-flight counts published by every process."""
+    slots = cache.get(MAINTENANCE_INFLIGHT_SLOTS_KEY) or 0
+    if not slots:
+        return 0
+    keys = [f"{MAINTENANCE_INFLIGHT_KEY_PREFIX}:{slot}" for slot in range(1, slots + 1)]
+    return sum(cache.get_many(keys).values())
+
+
+def drain_status(state, now=None):
+    """
+    Returns the number of requests still in flight while the window is
+    draining, or None once it has escalated to full maintenance.
+    """
+    if not is_drain_period(state, now):
+        return None
+    in_flight = in_flight_total()
+    return in_flight or None
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import uuid
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.utils import timezone
+from django_enterprise_maintenance_suite.warmup import get_setting
+
+MAINTENANCE_VERSION_KEY = "maintenance_status_version"
+
+
+def get_status_version():
+    """Current status version token, created on first use."""
+    version = cache.get(MAINTENANCE_VERSION_KEY)
+    if version is None:
+        cache.add(MAINTENANCE_VERSION_KEY, uuid.uuid4().hex[:12], timeout=None)
+        version = cache.get(MAINTENANCE_VERSION_KEY)
+    return version
+
+
+def bump_status_version():
+    """Invalidates the version token; called whenever maintenance data changes."""
+    cache.set(MAINTENANCE_VERSION_KEY, uuid.uuid4().hex[:12], timeout=None)
+
+
+class _LoopWaiters:
+    """Feed connections parked on one event loop."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.changed = asyncio.Event()
+        self.count = 0
+        self.task = None
+
+    def wake(self):
+        # Wake every waiter, then arm a fresh event for the next change
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class VersionWatcher:
+    """
+    Per-process watcher shared by every open feed connection.
+    One task per event loop polls the version token, and the status payload
+    is computed once per change, so idle connections cost no queries of
+    their own. Under ASGI all connections share a single loop; under WSGI
+    each request runs its own loop and is woken across threads.
+
+    build_payload returns (payload, next_boundary); the payload is rebuilt
+    when the token changes or a scheduled boundary passes, and the version
+    exposed to clients combines the token with payload['system_status'].
+    """
+
+    def __init__(self, build_payload):
+        self.build_payload = build_payload
+        self.token = None
+        self.version = None
+        self.payload = None
+        self.next_boundary = None
+        self._lock = threading.Lock()
+        self._loops = {}
+
+    async def current(self):
+        token = await sync_to_async(get_status_version)()
+        if token != self.token or self._boundary_passed():
+            await self._refresh(token)
+        return self.version, self.payload
+
+    async def wait_for_change(self, known_version, timeout):
+        """
+        Returns (version, payload) once the version differs from
+        known_version, or None if the timeout expires first.
+        """
+        version, payload = await self.current()
+        if version != known_version:
+            return version, payload
+
+        waiters = self._register()
+        try:
+            # A change may have landed between current() and registering
+            if self.version == known_version:
+                await asyncio.wait_for(waiters.changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._unregister(waiters)
+        return self.version, self.payload
+
+    def _register(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            waiters = self._loops.get(loop)
+            if waiters is None:
+                waiters = self._loops[loop] = _LoopWaiters(loop)
+            waiters.count += 1
+            if waiters.task is None or waiters.task.done():
+                waiters.task = loop.create_task(self._poll(waiters))
+        return waiters
+
+    def _unregister(self, waiters):
+        with self._lock:
+            waiters.count -= 1
+            if waiters.count:
+                return
+            # Last waiter on this loop: stop its poller and forget the loop
+            del self._loops[waiters.loop]
+        waiters.task.cancel()
+
+    async def _poll(self, waiters):
+        interval = get_setting('FEED_POLL_INTERVAL', 1)
+        while waiters.count:
+            await asyncio.sleep(interval)
+            token = await sync_to_async(get_status_version)()
+            if token != self.token or self._boundary_passed():
+                await self._refresh(token)
+
+    def _boundary_passed(self):
+        return self.next_boundary is not None and timezone.now() >= self.next_boundary
+
+    async def _refresh(self, token):
+        payload, next_boundary = await sync_to_async(self.build_payload)()
+        version = f"{token}-{payload.get('system_status', '')}"
+        with self._lock:
+            self.token = token
+            self.payload = payload
+            self.next_boundary = next_boundary
+            if version == self.version:
+                return
+            self.version = version
+            loops = list(self._loops.values())
+
+        running = asyncio.get_running_loop()
+        for waiters in loops:
+            if waiters.loop is running:
+                waiters.wake()
+                continue
+            try:
+                waiters.loop.call_soon_threadsafe(waiters.wake)
+            except RuntimeError:
+                # That loop has already shut down
+                pass
@@ -1,13 +1,20 @@
+import json
 import sys
+from datetime import date
 from django.core.management.base import BaseCommand
 from django.core.management import CommandError
+from django.core.exceptions import ValidationError
 from django.utils import timezone
-from django.contrib.auth import get_user_model
 from django_enterprise_maintenance_suite.models import MaintenanceState
+from django_enterprise_maintenance_suite.drain import drain_status
 from django_enterprise_maintenance_suite.services.maintenance import MaintenanceService
-from django_enterprise_maintenance_suite.services.exceptions import InvalidTransitionError
-
-User = get_user_model()
+from django_enterprise_maintenance_suite.services.exceptions import InvalidTransitionError, ImportValidationError
+from django_enterprise_maintenance_suite.services.deferral import replay_pending
+from django_enterprise_maintenance_suite.services.outbox import dispatch_pending
+from django_enterprise_maintenance_suite.probe import probe
+from django_enterprise_maintenance_suite.services.reporting import downtime_report
+from django_enterprise_maintenance_suite.services.shadow import shadow_report
+from django_enterprise_maintenance_suite.services.bulk import dump_rows, export_windows, import_windows, load_rows
 
 
 class Command(BaseCommand):
@@ -21,10 +28,15 @@ class Command(BaseCommand):
         subparsers = parser.add_subparsers(dest="action", required=True)
 
         # STATUS
-        subparsers.add_parser(
+        status = subparsers.add_parser(
             "status",
             help="Show current real-time maintenance status",
         )
+        status.add_argument(
+            "--probe",
+            action="store_true",
+            help="Readiness-probe output: JSON, served from the cached snapshot when possible",
+        )
 
         # ENABLE
         enable = subparsers.add_parser(
@@ -57,6 +69,23 @@ class Command(BaseCommand):
             action="store_true",
             help="Override existing active maintenance",
         )
+        enable.add_argument(
+            "--rollout",
+            type=int,
+            default=100,
+            help="Initial share of clients (0-100) the window applies to",
+        )
+        enable.add_argument(
+            "--rollout-key",
+            choices=[choice[0] for choice in MaintenanceState.RolloutKey.choices],
+            default=MaintenanceState.RolloutKey.IP,
+            help="What clients are hashed by for the rollout cohort",
+        )
+        enable.add_argument(
+            "--rollout-header",
+            default="",
+            help="Header hashed when --rollout-key is 'header' (e.g. X-Tenant-ID)",
+        )
 
         # DISABLE
         disable = subparsers.add_parser(
@@ -69,6 +98,134 @@ class Command(BaseCommand):
             help="Username performing this action (audit & governance)",
         )
 
+        # REPLAY
+        replay = subparsers.add_parser(
+            "replay",
+            help="Replay write requests deferred during read-only windows",
+        )
+        replay.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of queued requests fetched per batch",
+        )
+        replay.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Maximum number of requests replayed in parallel",
+        )
+
+        # DISPATCH
+        dispatch = subparsers.add_parser(
+            "dispatch",
+            help="Deliver pending transition notifications from the outbox",
+        )
+        dispatch.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Number of outbox events delivered per batch",
+        )
+        dispatch.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Maximum number of deliveries in parallel",
+        )
+
+        # REPORT
+        report = subparsers.add_parser(
+            "report",
+            help="Monthly downtime minutes per mode (SLA reporting)",
+        )
+        report.add_argument(
+            "--from",
+            dest="start_date",
+            type=date.fromisoformat,
+            help="First day to include (YYYY-MM-DD)",
+        )
+        report.add_argument(
+            "--to",
+            dest="end_date",
+            type=date.fromisoformat,
+            help="Last day to include (YYYY-MM-DD)",
+        )
+        report.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the report as JSON",
+        )
+
+        # IMPORT
+        import_ = subparsers.add_parser(
+            "import",
+            help="Bulk-create scheduled windows from a JSON/CSV file",
+        )
+        import_.add_argument("path", help="File to read ('-' for stdin)")
+        import_.add_argument(
+            "--actor",
+            required=True,
+            help="Username performing this action (audit & governance)",
+        )
+        import_.add_argument(
+            "--format",
+            choices=["json", "csv"],
+            help="File format (defaults to the file extension)",
+        )
+
+        # EXPORT
+        export = subparsers.add_parser(
+            "export",
+            help="Write maintenance windows to a JSON/CSV file",
+        )
+        export.add_argument("path", help="File to write ('-' for stdout)")
+        export.add_argument(
+            "--format",
+            choices=["json", "csv"],
+            help="File format (defaults to the file extension)",
+        )
+        export.add_argument(
+            "--status",
+            choices=[choice[0] for choice in MaintenanceState.Status.choices],
+            action="append",
+            help="Only export windows with this status (repeatable)",
+        )
+
+        # SHADOW
+        shadow = subparsers.add_parser(
+            "shadow",
+            help="Show what a shadow (dry-run) window would have blocked",
+        )
+        shadow.add_argument(
+            "--window",
+            type=int,
+            help="Window ID (defaults to the latest shadow window)",
+        )
+
+        # ROLLOUT
+        rollout = subparsers.add_parser(
+            "rollout",
+            help="Set the rollout percentage of a maintenance window (raise-only once approved)",
+        )
+        rollout.add_argument(
+            "--window",
+            type=int,
+            required=True,
+            help="Window ID",
+        )
+        rollout.add_argument(
+            "--percentage",
+            type=int,
+            required=True,
+            help="New share of clients (0-100) the window applies to",
+        )
+        rollout.add_argument(
+            "--actor",
+            required=True,
+            help="Username performing this action (audit & governance)",
+        )
+
     # ------------------------------------------------------------------
     # ENTRY POINT
     # ------------------------------------------------------------------
@@ -77,17 +234,35 @@ class Command(BaseCommand):
         action = options["action"]
 
         if action == "status":
-            self.handle_status()
+            self.handle_status(options)
         elif action == "enable":
             self.handle_enable(options)
         elif action == "disable":
             self.handle_disable(options)
+        elif action == "replay":
+            self.handle_replay(options)
+        elif action == "dispatch":
+            self.handle_dispatch(options)
+        elif action == "report":
+            self.handle_report(options)
+        elif action == "import":
+            self.handle_import(options)
+        elif action == "export":
+            self.handle_export(options)
+        elif action == "shadow":
+            self.handle_shadow(options)
+        elif action == "rollout":
+            self.handle_rollout(options)
 
     # ------------------------------------------------------------------
     # HELPERS
     # ------------------------------------------------------------------
 
     def get_actor(self, username):
+        # Resolved lazily so read-only subcommands never load the user model
+        from django.contrib.auth import get_user_model
+
+        User = get_user_model()
         try:
             return User.objects.get(username=username)
         except User.DoesNotExist:
@@ -96,29 +271,61 @@ class Command(BaseCommand):
                 "Create the user or pass a valid username."
             )
 
+    def get_format(self, options):
+        if options["format"]:
+            return options["format"]
+        return "csv" if options["path"].lower().endswith(".csv") else "json"
+
     # ------------------------------------------------------------------
     # STATUS
     # ------------------------------------------------------------------
 
-    def handle_status(self):
+    def handle_status(self, options):
+        if options["probe"]:
+            data, exit_code = probe()
+            self.stdout.write(json.dumps(data))
+            sys.exit(exit_code)
+
         active = (
             MaintenanceState.objects
             .filter(
                 is_enabled=True,
+                is_shadow=False,
                 status=MaintenanceState.Status.APPROVED,
             )
             .order_by("-created_at")
             .first()
         )
 
-        if active and active.is_enabled:
+        if active and active.rollout_percentage < 100:
             self.stdout.write(
                 self.style.WARNING(
-                    f"⚠️  SYSTEM STATUS: {active.get_mode_display().upper()}"
+                    f"⚠️  SYSTEM STATUS: PARTIAL, {active.get_mode_display().upper()} "
+                    f"for {active.rollout_percentage}% of clients"
                 )
             )
             self.stdout.write(f"Reason: {active.reason}")
             self.stdout.write(f"Window ID: {active.id}")
+            if active.end_time:
+                self.stdout.write(f"Expires at: {active.end_time}")
+            sys.exit(0)
+
+        if active and active.is_enabled:
+            in_flight = drain_status(active)
+            if in_flight:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"⚠️  SYSTEM STATUS: DRAINING, {in_flight} in flight"
+                    )
+                )
+            else:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"⚠️  SYSTEM STATUS: {active.get_mode_display().upper()}"
+                    )
+                )
+            self.stdout.write(f"Reason: {active.reason}")
+            self.stdout.write(f"Window ID: {active.id}")
             if active.end_time:
                 self.stdout.write(f"Expires at: {active.end_time}")
             sys.exit(1)
@@ -135,6 +342,7 @@ class Command(BaseCommand):
 
         active_exists = MaintenanceState.objects.filter(
             is_enabled=True,
+            is_shadow=False,
             status=MaintenanceState.Status.APPROVED,
         ).exists()
 
@@ -152,13 +360,20 @@ class Command(BaseCommand):
                 minutes=options["minutes"]
             )
 
-        window = MaintenanceState.objects.create(
-            mode=options["mode"],
-            reason=options["reason"],
-            start_time=timezone.now(),
-            end_time=end_time,
-            created_by=actor,
-        )
+        try:
+            window = MaintenanceState.objects.create(
+                mode=options["mode"],
+                reason=options["reason"],
+                start_time=timezone.now(),
+                end_time=end_time,
+                created_by=actor,
+                rollout_percentage=options["rollout"],
+                rollout_key=options["rollout_key"],
+                rollout_header=options["rollout_header"],
+            )
+        except ValidationError as exc:
+            self.stdout.write(self.style.ERROR("; ".join(exc.messages)))
+            sys.exit(3)
 
         try:
             MaintenanceService.approve(
@@ -177,6 +392,8 @@ class Command(BaseCommand):
             )
         )
         self.stdout.write(f"Reason: {options['reason']}")
+        if window.rollout_percentage < 100:
+            self.stdout.write(f"Rollout: {window.rollout_percentage}% of clients")
         if end_time:
             self.stdout.write(f"Auto-expires at: {end_time}")
 
@@ -229,3 +446,202 @@ class Command(BaseCommand):
             )
 
         sys.exit(0 if failed == 0 else 4)
+
+    # ------------------------------------------------------------------
+    # REPLAY
+    # ------------------------------------------------------------------
+
+    def handle_replay(self, options):
+        active_exists = MaintenanceState.objects.filter(
+            is_enabled=True,
+            is_shadow=False,
+            status=MaintenanceState.Status.APPROVED,
+        ).exists()
+
+        if active_exists:
+            self.stdout.write(
+                self.style.ERROR(
+                    "Maintenance still active. Complete the window before replaying."
+                )
+            )
+            sys.exit(2)
+
+        replayed = 0
+        failed = 0
+
+        for batch_replayed, batch_failed in replay_pending(
+            batch_size=options["batch_size"],
+            concurrency=options["concurrency"],
+        ):
+            replayed += batch_replayed
+            failed += batch_failed
+            self.stdout.write(
+                f"Batch done: {batch_replayed} replayed, {batch_failed} failed"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{replayed} deferred request(s) replayed.")
+        )
+        if failed:
+            self.stdout.write(
+                self.style.ERROR(f"{failed} deferred request(s) failed.")
+            )
+
+        sys.exit(0 if failed == 0 else 4)
+
+    # ------------------------------------------------------------------
+    # DISPATCH
+    # ------------------------------------------------------------------
+
+    def handle_dispatch(self, options):
+        delivered, failed = dispatch_pending(
+            batch_size=options["batch_size"],
+            max_workers=options["workers"],
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{delivered} outbox event(s) delivered.")
+        )
+        if failed:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"{failed} outbox event(s) gave up after repeated failures."
+                )
+            )
+
+        sys.exit(0 if failed == 0 else 4)
+
+    # ------------------------------------------------------------------
+    # REPORT
+    # ------------------------------------------------------------------
+
+    def handle_report(self, options):
+        report = downtime_report(options["start_date"], options["end_date"])
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report))
+            sys.exit(0)
+
+        if not report:
+            self.stdout.write(self.style.WARNING("No downtime recorded."))
+            sys.exit(0)
+
+        for month, modes in report.items():
+            for mode, totals in modes.items():
+                self.stdout.write(
+                    f"{month}  {mode:<12} {totals['minutes']:>10.2f} min  "
+                    f"({totals['windows']} window(s))"
+                )
+
+        sys.exit(0)
+
+    # ------------------------------------------------------------------
+    # IMPORT / EXPORT
+    # ------------------------------------------------------------------
+
+    def handle_import(self, options):
+        actor = self.get_actor(options["actor"])
+        fmt = self.get_format(options)
+
+        try:
+            if options["path"] == "-":
+                rows = load_rows(sys.stdin, fmt)
+            else:
+                with open(options["path"], newline="", encoding="utf-8") as stream:
+                    rows = load_rows(stream, fmt)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not read {options['path']}: {exc}")
+
+        try:
+            windows = import_windows(rows, actor, ip="127.0.0.1")
+        except ImportValidationError as exc:
+            for error in exc.errors:
+                self.stdout.write(self.style.ERROR(error))
+            self.stdout.write(self.style.ERROR(str(exc)))
+            sys.exit(2)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {len(windows)} window(s) as PENDING by '{actor.username}'."
+            )
+        )
+        sys.exit(0)
+
+    def handle_export(self, options):
+        fmt = self.get_format(options)
+        windows = MaintenanceState.objects.all()
+        if options["status"]:
+            windows = windows.filter(status__in=options["status"])
+        rows = export_windows(windows)
+
+        if options["path"] == "-":
+            dump_rows(rows, self.stdout, fmt)
+        else:
+            with open(options["path"], "w", newline="", encoding="utf-8") as stream:
+                dump_rows(rows, stream, fmt)
+            self.stdout.write(
+                self.style.SUCCESS(f"Exported {len(rows)} window(s) to {options['path']}.")
+            )
+        sys.exit(0)
+
+    # ------------------------------------------------------------------
+    # SHADOW
+    # ------------------------------------------------------------------
+
+    def handle_shadow(self, options):
+        windows = MaintenanceState.objects.filter(is_shadow=True)
+        if options["window"]:
+            windows = windows.filter(pk=options["window"])
+        window = windows.order_by("-created_at").first()
+
+        if window is None:
+            self.stdout.write(self.style.WARNING("No shadow window found."))
+            sys.exit(0)
+
+        report = shadow_report(window)
+        self.stdout.write(
+            self.style.WARNING(
+                f"Window {window.id} ({window.get_mode_display()}) would have blocked "
+                f"~{report['total']} request(s)"
+            )
+        )
+        self.stdout.write("By path prefix:")
+        for row in report["by_prefix"]:
+            self.stdout.write(f"  {row['path_prefix']:<40} {row['count']:>10}")
+        self.stdout.write("By method:")
+        for row in report["by_method"]:
+            self.stdout.write(f"  {row['method']:<40} {row['count']:>10}")
+
+        sys.exit(0)
+
+    # ------------------------------------------------------------------
+    # ROLLOUT
+    # ------------------------------------------------------------------
+
+    def handle_rollout(self, options):
+        actor = self.get_actor(options["actor"])
+
+        try:
+            window = MaintenanceState.objects.get(pk=options["window"])
+        except MaintenanceState.DoesNotExist:
+            raise CommandError(f"Maintenance window {options['window']} does not exist.")
+
+        previous = window.rollout_percentage
+        try:
+            MaintenanceService.set_rollout(
+                window,
+                options["percentage"],
+                user=actor,
+                ip="127.0.0.1",
+            )
+        except InvalidTransitionError as exc:
+            self.stdout.write(self.style.ERROR(str(exc)))
+            sys.exit(3)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Window {window.id} rollout changed from {previous}% to "
+                f"{window.rollout_percentage}% by '{actor.username}'"
+            )
+        )
+        sys.exit(0)
@@ -5,6 +5,18 @@ class MaintenanceStateQuerySet(models.QuerySet):
     def active(self):
         return self.filter(is_enabled=True)
 
+    def current_window(self):
+        """
+        Latest enabled, approved window with its URL exceptions prefetched.
+        Real windows take precedence over shadow (dry-run) ones.
+        """
+        return (
+            self.filter(is_enabled=True, status=self.model.Status.APPROVED)
+            .order_by('is_shadow', '-created_at')
+            .prefetch_related('exceptions')
+            .first()
+        )
+
     def protected(self):
         return self.filter(
             status__in=[
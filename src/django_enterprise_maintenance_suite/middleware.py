@@ -1,51 +1,136 @@
-from django.conf import settings
-from django.utils.module_loading import import_string
+import inspect
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.http import JsonResponse, HttpResponse
-from django.shortcuts import render
-from django.template import TemplateDoesNotExist
-from django.db import transaction
-from django_enterprise_maintenance_suite.models import MaintenanceState
+from django_enterprise_maintenance_suite.warmup import get_setting, load_backend_class, warm_up
+
+
+def _never(*args):
+    return False
+
+
+def _takes_state(method):
+    """True if a backend's is_write_method accepts the window as well."""
+    try:
+        parameters = inspect.signature(method).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    positional = [
+        p for p in parameters
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD, p.VAR_POSITIONAL)
+    ]
+    return len(positional) >= 2 or any(p.kind == p.VAR_POSITIONAL for p in positional)
+
 
 class MaintenanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Enforcement uses the ORM and transactions, so it runs in a thread
+            self.sync_get_response = async_to_sync(get_response)
         
         # 1. Load the Backend Class dynamically from settings
-        conf = getattr(settings, 'MAINTENANCE_SUITE', {})
-        backend_path = conf.get(
-            'BACKEND', 
-            'enterprise_maintenance_suit.backends.DefaultMaintenanceBackend'
-        )
-        self.backend = import_string(backend_path)()
+        self.backend = load_backend_class()()
+
+        # 2. Resolve URLs and preload state before the first request
+        warm_up(self.backend)
+
+        # 3. Optional hooks: custom backends written against the original
+        # interface (get_maintenance_window + is_write_method(request)) keep
+        # working, they just don't get bypass, deferral or async exemptions.
+        backend = self.backend
+        self.is_exempt = getattr(backend, 'is_exempt', None)
+        self.has_bypass_cookie = getattr(backend, 'has_bypass_cookie', _never)
+        self.is_bypassed = getattr(backend, 'is_bypassed', _never)
+        self.set_bypass_cookie = getattr(backend, 'set_bypass_cookie', None)
+        self.is_deferrable = getattr(backend, 'is_deferrable', _never)
+        if _takes_state(backend.is_write_method):
+            self.is_write_method = backend.is_write_method
+        else:
+            self.is_write_method = lambda request, state: backend.is_write_method(request)
 
     def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.handle(request, self.get_response)
+
+    async def __acall__(self, request):
+        # Exempt paths (status feed, admin) stay on the event loop, so a
+        # parked long-poll does not hold a worker thread.
+        if self.is_exempt is not None and self.is_exempt(request):
+            return await self.get_response(request)
+        return await sync_to_async(self.handle, thread_sensitive=True)(request, self.sync_get_response)
+
+    def handle(self, request, get_response):
+        # Loaded with the app by now; imported here to keep module load light
+        from django_enterprise_maintenance_suite import drain
+
         # Ask the backend: "Is there an active window for this request?"
         current_state = self.backend.get_maintenance_window(request)
 
         if not current_state:
-            return self.get_response(request)
+            if getattr(request, 'maintenance_exempt', False):
+                return get_response(request)
+
+            # Track in-flight work so a starting window can drain it
+            drain.counter.increment()
+            try:
+                return get_response(request)
+            finally:
+                drain.counter.decrement()
+
+        # --- SHADOW (dry run): record what would be blocked, never block ---
+        if current_state.is_shadow:
+            if self.would_block(request, current_state):
+                from django_enterprise_maintenance_suite import shadow
+
+                shadow.aggregator.record(current_state.pk, request.path_info, request.method)
+            return get_response(request)
+
+        # Staff / token bypass (cached in a signed cookie per window version)
+        if self.has_bypass_cookie(request, current_state):
+            return get_response(request)
+        if self.is_bypassed(request, current_state):
+            response = get_response(request)
+            if self.set_bypass_cookie is not None:
+                self.set_bypass_cookie(request, response, current_state)
+            return response
 
         # --- MODE: MAINTENANCE (503) ---
-        if current_state.mode == MaintenanceState.Mode.MAINTENANCE:
+        if current_state.mode == current_state.Mode.MAINTENANCE:
+            # During the drain phase new requests are refused while the
+            # requests already in flight are allowed to finish.
+            deadline = drain.drain_deadline(current_state)
+            if deadline and drain.is_drain_period(current_state):
+                drain.counter.watch(deadline)
+
             if request.headers.get('Accept') == 'application/json':
                  return JsonResponse({
                      "error": "Service Unavailable", 
                      "reason": current_state.reason
                  }, status=503)
             
-            # (Rendering logic remains here as it's view-layer concern)
-            template_name = getattr(settings, 'MAINTENANCE_SUITE', {}).get('MAINTENANCE_TEMPLATE', 'enterprise_maintenance_suit/503.html')
-            try:
-                return render(request, template_name, {'state': current_state}, status=503)
-            except TemplateDoesNotExist:
-                return HttpResponse(f"<h1>Service Unavailable</h1><p>{current_state.reason}</p>", status=503)
+            return self.render_maintenance(request, current_state)
 
         # --- MODE: READ_ONLY ---
-        if current_state.mode == MaintenanceState.Mode.READ_ONLY:
-            
+        if current_state.mode == current_state.Mode.READ_ONLY:
+            # Deferral and transaction machinery is only needed for READ_ONLY
+            from django.db import transaction
+            from django_enterprise_maintenance_suite.services.deferral import spool_request
+
             # Ask the backend: "Is this a write method?"
-            if self.backend.is_write_method(request):
-                 return JsonResponse({
+            if self.is_write_method(request, current_state):
+                if self.is_deferrable(request):
+                    deferred = spool_request(request, current_state)
+                    return JsonResponse({
+                        "detail": "Request queued for replay after maintenance.",
+                        "id": deferred.pk,
+                    }, status=202)
+                return JsonResponse({
                      "error": "Read Only Mode", 
                      "detail": "Write requests are blocked."
                  }, status=403)
@@ -53,11 +138,28 @@ class MaintenanceMiddleware:
             # Strict Transaction Rollback
             try:
                 with transaction.atomic():
-                    response = self.get_response(request)
+                    response = get_response(request)
                     transaction.set_rollback(True)
                     response['X-Maintenance-Mode'] = 'Read-Only-Strict'
                     return response
             except Exception:
                 raise
 
-        return self.get_response(request)
\ No newline at end of file
+        return get_response(request)
+
+    def would_block(self, request, current_state):
+        if current_state.mode == current_state.Mode.MAINTENANCE:
+            return True
+        return self.is_write_method(request, current_state)
+
+    def render_maintenance(self, request, current_state):
+        # (Rendering logic remains here as it's view-layer concern)
+        # Template machinery is only imported once a page is actually rendered
+        from django.shortcuts import render
+        from django.template import TemplateDoesNotExist
+
+        template_name = get_setting('MAINTENANCE_TEMPLATE', '503.html')
+        try:
+            return render(request, template_name, {'state': current_state, 'reason': current_state.reason, 'end_time': current_state.end_time}, status=503)
+        except TemplateDoesNotExist:
+            return HttpResponse(f"<h1>Service Unavailable</h1><p>{current_state.reason}</p>", status=503)
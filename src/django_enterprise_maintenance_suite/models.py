@@ -1,14 +1,21 @@
+import hashlib
+import json
 from django.db import models
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MaxValueValidator
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from django.core.cache import cache
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django_enterprise_maintenance_suite.manager import MaintenanceStateQuerySet
+from django_enterprise_maintenance_suite.policy import validate_rules
 
 MAINTENANCE_CACHE_KEY = "active_maintenance_window"
+MAINTENANCE_CACHE_TIMEOUT = 3600
 
 class MaintenanceStateManager(models.Manager.from_queryset(MaintenanceStateQuerySet)):
     pass
@@ -24,6 +31,12 @@ class MaintenanceState(models.Model):
         REJECTED = 'rejected'
         ABORTED = 'aborted'
         COMPLETED = 'completed'
+
+    class RolloutKey(models.TextChoices):
+        SESSION = 'session', _('Session cookie')
+        USER = 'user', _('User ID')
+        HEADER = 'header', _('Request header')
+        IP = 'ip', _('Client IP')
     objects = MaintenanceStateManager()
     mode = models.CharField(max_length=20, choices=Mode.choices, default=Mode.MAINTENANCE)
     reason = models.TextField(help_text="Why is this maintenance required?")
@@ -36,21 +49,90 @@ class MaintenanceState(models.Model):
         related_name="maintenance_approvals"
     )
     is_enabled = models.BooleanField(default=False)
+    enabled_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the window was last enabled; anchors the drain phase."
+    )
+    is_shadow = models.BooleanField(
+        default=False,
+        help_text="Dry run: evaluate and record what would be blocked, but never block."
+    )
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     start_time = models.DateTimeField(null=True, blank=True)
     end_time = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    rollout_percentage = models.PositiveSmallIntegerField(
+        default=100,
+        validators=[MaxValueValidator(100)],
+        help_text="Share of clients (by consistent hash) the window applies to."
+    )
+    rollout_key = models.CharField(max_length=20, choices=RolloutKey.choices, default=RolloutKey.IP)
+    rollout_header = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Header hashed when the rollout key is 'header' (e.g. X-Tenant-ID)."
+    )
+    read_only_rules = models.JSONField(
+        default=list,
+        blank=True,
+        help_text='Extra requests allowed in READ_ONLY mode, e.g. [{"methods": ["POST"], "path": "^graphql/$"}]'
+    )
 
     def clean(self):
         if self.start_time and self.end_time and self.start_time > self.end_time:
             raise ValidationError(_("End time must be after start time."))
 
+        validate_rules(self.read_only_rules)
+
+        if self.rollout_key == self.RolloutKey.HEADER and not self.rollout_header:
+            raise ValidationError(_("A rollout header is required when hashing by header."))
+
         if self.is_enabled and self.status != self.Status.APPROVED:
             raise ValidationError(_("Only APPROVED maintenance windows can be enabled."))
 
     def save(self, *args, **kwargs):
         self.full_clean()
+        # Track when the window took effect, whichever path enabled it
+        if self.is_enabled and self.enabled_at is None:
+            self.enabled_at = timezone.now()
+        elif not self.is_enabled:
+            self.enabled_at = None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'is_enabled' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'enabled_at'}
         super().save(*args, **kwargs)
+        # The saved revision gets a fresh version on next access
+        self.__dict__.pop('version', None)
+
+    @property
+    def is_active(self):
+        """Enabled, approved and inside its schedule right now."""
+        if not self.is_enabled or self.status != self.Status.APPROVED:
+            return False
+        now = timezone.now()
+        if self.start_time and now < self.start_time:
+            return False
+        if self.end_time and now > self.end_time:
+            return False
+        return True
+
+    @cached_property
+    def version(self):
+        """
+        Short token identifying this revision of the window.
+        Changes whenever the window is re-scheduled, transitions or its
+        URL exceptions change. Computed once per instance; cached snapshots
+        carry it so requests never re-hash the window.
+        """
+        exceptions = sorted(exception.pattern for exception in self.exceptions.all())
+        raw = (
+            f"{self.pk}:{self.mode}:{self.status}:{self.is_enabled}:{self.is_shadow}:{self.start_time}:{self.end_time}:"
+            f"{self.rollout_percentage}:{self.rollout_key}:{self.rollout_header}:"
+            f"{json.dumps(self.read_only_rules, sort_keys=True)}:{json.dumps(exceptions)}"
+        )
+        return hashlib.sha1(raw.encode()).hexdigest()[:12]
 
     def __str__(self):
         status = "ENABLED" if self.is_enabled else "DISABLED"
@@ -87,6 +169,7 @@ class MaintenanceAuditLog(models.Model):
         ('APPROVE', 'Approved Window'),
         ('REJECT', 'Rejected Window'),
         ('DELETE', 'Deleted Window'),
+        ('ROLLOUT', 'Changed Rollout Percentage'),
     ]
 
     actor = models.ForeignKey(
@@ -144,3 +227,124 @@ class MaintenanceIgnoreURL(models.Model):
 
     def __str__(self):
         return self.pattern
+
+class DeferredRequest(models.Model):
+    """
+    Write request spooled during a READ_ONLY window, replayed afterwards.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending'
+        REPLAYING = 'replaying'
+        REPLAYED = 'replayed'
+        FAILED = 'failed'
+
+    maintenance_window = models.ForeignKey(
+        MaintenanceState,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='deferred_requests'
+    )
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=2048)
+    query_string = models.TextField(blank=True)
+    headers = models.JSONField(default=dict, help_text="WSGI META headers of the original request")
+    body = models.BinaryField(blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    replayed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['pk']
+        verbose_name = "Deferred Request"
+        indexes = [
+            models.Index(fields=['status', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.status})"
+
+class MaintenanceOutboxEvent(models.Model):
+    """
+    Transition event written in the same transaction as the transition,
+    delivered asynchronously. One row is written per target (each webhook
+    URL, plus one for internal receivers) so retries never repeat a
+    delivery that already succeeded.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending'
+        DELIVERED = 'delivered'
+        FAILED = 'failed'
+
+    event = models.CharField(max_length=20)
+    maintenance_window = models.ForeignKey(
+        MaintenanceState,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='outbox_events'
+    )
+    # Webhook URL, or blank for the internal maintenance_event signal
+    target = models.CharField(max_length=500, blank=True)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['pk']
+        verbose_name = "Outbox Event"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.event} ({self.status})"
+
+class MaintenanceDowntimeRollup(models.Model):
+    """
+    Per-day, per-mode downtime totals, updated when a window is closed.
+    """
+    day = models.DateField()
+    mode = models.CharField(max_length=20, choices=MaintenanceState.Mode.choices)
+    seconds = models.PositiveIntegerField(default=0)
+    windows = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['day', 'mode']
+        verbose_name = "Downtime Rollup"
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'mode'], name='unique_downtime_rollup_day_mode'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.mode}: {self.seconds // 60} min"
+
+class ShadowDecisionCount(models.Model):
+    """
+    Requests a shadow window would have blocked, per path prefix and method.
+    """
+    maintenance_window = models.ForeignKey(
+        MaintenanceState,
+        on_delete=models.CASCADE,
+        related_name='shadow_counts'
+    )
+    path_prefix = models.CharField(max_length=255)
+    method = models.CharField(max_length=10)
+    count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Shadow Decision Count"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['maintenance_window', 'path_prefix', 'method'],
+                name='unique_shadow_decision_count',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.method} {self.path_prefix}: {self.count}"
+
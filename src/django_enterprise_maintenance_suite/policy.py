@@ -0,0 +1,90 @@
+import re
+from django.core.exceptions import ValidationError
+
+DEFAULT_ALLOWED_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def validate_rules(rules):
+    """Raises ValidationError if read-only rules are malformed."""
+    if not isinstance(rules, list):
+        raise ValidationError("Read-only rules must be a list.")
+    for rule in rules:
+        if not isinstance(rule, dict) or not rule.get('methods'):
+            raise ValidationError("Each read-only rule needs a list of 'methods'.")
+        methods = rule['methods']
+        if not isinstance(methods, list) or not all(isinstance(m, str) for m in methods):
+            raise ValidationError(f"Read-only rule 'methods' must be a list of HTTP methods, got {methods!r}.")
+        if 'path' in rule and 'prefix' in rule:
+            raise ValidationError("A read-only rule takes either 'path' or 'prefix', not both.")
+        for key in ('path', 'prefix'):
+            if key in rule and not isinstance(rule[key], str):
+                raise ValidationError(f"Read-only rule '{key}' must be a string, got {rule[key]!r}.")
+        headers = rule.get('headers')
+        if headers is not None and (
+            not isinstance(headers, dict)
+            or not all(isinstance(k, str) and isinstance(v, str) for k, v in headers.items())
+        ):
+            raise ValidationError(f"Read-only rule 'headers' must map header names to strings, got {headers!r}.")
+        try:
+            re.compile(_rule_pattern(rule))
+        except re.error as exc:
+            raise ValidationError(f"Invalid read-only rule path {rule.get('path')!r}: {exc}")
+
+
+def _rule_pattern(rule):
+    if 'prefix' in rule:
+        return re.escape(rule['prefix'].lstrip('/'))
+    return rule.get('path', '').lstrip('/')
+
+
+class ReadOnlyPolicy:
+    """
+    Compiled read-only write policy.
+
+    Rules look like {"methods": ["POST"], "path": "^graphql/$"} or
+    {"methods": ["PUT"], "prefix": "/api/cache-warm", "headers": {"X-Op": "query"}}
+    and allow the matching requests through a READ_ONLY window.
+    Each rule is compiled on its own (merging them would let one rule's
+    groups clash with another's) and grouped by method, so a request only
+    tries the rules for its own method; rules with header conditions are
+    checked afterwards.
+    """
+
+    def __init__(self, allowed_methods=DEFAULT_ALLOWED_METHODS, rules=()):
+        self.allowed_methods = frozenset(m.upper() for m in allowed_methods)
+        path_patterns = {}
+        header_rules = {}
+
+        for rule in rules:
+            pattern = _rule_pattern(rule)
+            headers = tuple(
+                (name, value) for name, value in (rule.get('headers') or {}).items()
+            )
+            for method in rule['methods']:
+                method = method.upper()
+                if headers:
+                    header_rules.setdefault(method, []).append((re.compile(pattern), headers))
+                else:
+                    path_patterns.setdefault(method, []).append(re.compile(pattern))
+
+        self.path_matchers = {method: tuple(ps) for method, ps in path_patterns.items()}
+        self.header_rules = {method: tuple(rs) for method, rs in header_rules.items()}
+        self.ruled_methods = frozenset(self.path_matchers) | frozenset(self.header_rules)
+
+    def is_write(self, request):
+        method = request.method
+        if method in self.allowed_methods:
+            return False
+        if method not in self.ruled_methods:
+            return True
+
+        path = request.path_info.lstrip('/')
+        for pattern in self.path_matchers.get(method, ()):
+            if pattern.match(path):
+                return False
+        for pattern, headers in self.header_rules.get(method, ()):
+            if pattern.match(path) and all(
+                request.headers.get(name) == value for name, value in headers
+            ):
+                return False
+        return True
@@ -0,0 +1,134 @@
+"""
+Lightweight readiness probe.
+
+Reads a plain state snapshot from the shared cache and only sets up the
+ORM on a miss, so it can run without the management-command machinery:
+
+    DJANGO_SETTINGS_MODULE=project.settings python -m django_enterprise_maintenance_suite.probe
+
+Prints a JSON document and exits 0 when operational or at a partial
+rollout, 1 otherwise.
+"""
+import json
+import sys
+from datetime import datetime, timedelta
+
+MAINTENANCE_SNAPSHOT_KEY = "active_maintenance_snapshot"
+MAINTENANCE_SNAPSHOT_TIMEOUT = 3600
+
+
+def build_snapshot(state):
+    """Plain, pickle-free description of a window (False when none is enforced)."""
+    if not state or state.is_shadow:
+        return False
+    from django_enterprise_maintenance_suite.drain import drain_start
+
+    drain_from = drain_start(state)
+    return {
+        "window_id": state.pk,
+        "mode": state.mode,
+        "reason": state.reason,
+        "start_time": state.start_time.isoformat() if state.start_time else None,
+        "end_time": state.end_time.isoformat() if state.end_time else None,
+        "drain_start": drain_from.isoformat() if drain_from else None,
+        "rollout_percentage": state.rollout_percentage,
+    }
+
+
+def cache_snapshot(state, overwrite=True):
+    """
+    Stores the snapshot of state. Readers filling a cache miss pass
+    overwrite=False so they never replace a fresher snapshot written by
+    the on-commit primer in the meantime.
+    """
+    from django.core.cache import cache
+
+    snapshot = build_snapshot(state)
+    if overwrite:
+        cache.set(MAINTENANCE_SNAPSHOT_KEY, snapshot, timeout=MAINTENANCE_SNAPSHOT_TIMEOUT)
+    else:
+        cache.add(MAINTENANCE_SNAPSHOT_KEY, snapshot, timeout=MAINTENANCE_SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def _load_snapshot():
+    """Returns (snapshot, source); the database is only touched on a cache miss."""
+    from django.core.cache import cache
+
+    snapshot = cache.get(MAINTENANCE_SNAPSHOT_KEY)
+    if snapshot is not None:
+        return snapshot, "cache"
+
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    from django_enterprise_maintenance_suite.models import MaintenanceState
+
+    return cache_snapshot(MaintenanceState.objects.current_window(), overwrite=False), "db"
+
+
+def probe():
+    """
+    Returns (data, exit_code) describing the current maintenance state,
+    applying the same schedule rules as the middleware. A window rolled out
+    to only part of the clients reports "partial" and exits 0: most traffic
+    is still served.
+    """
+    from django.utils import timezone
+    from django_enterprise_maintenance_suite.drain import in_flight_total
+    from django_enterprise_maintenance_suite.warmup import get_setting
+
+    snapshot, source = _load_snapshot()
+    data = {
+        "system_status": "operational",
+        "window_id": None,
+        "mode": None,
+        "reason": None,
+        "end_time": None,
+        "in_flight": None,
+        "rollout_percentage": None,
+        "source": source,
+    }
+    if not snapshot:
+        return data, 0
+
+    now = timezone.now()
+    start_time = datetime.fromisoformat(snapshot["start_time"]) if snapshot["start_time"] else None
+    end_time = datetime.fromisoformat(snapshot["end_time"]) if snapshot["end_time"] else None
+    if (start_time and now < start_time) or (end_time and now > end_time):
+        return data, 0
+
+    rollout_percentage = snapshot.get("rollout_percentage", 100)
+    data.update(
+        system_status=snapshot["mode"],
+        window_id=snapshot["window_id"],
+        mode=snapshot["mode"],
+        reason=snapshot["reason"],
+        end_time=snapshot["end_time"],
+        rollout_percentage=rollout_percentage,
+    )
+    if rollout_percentage < 100:
+        data["system_status"] = "partial"
+        return data, 0
+
+    drain_timeout = get_setting('DRAIN_TIMEOUT', 0)
+    drain_from = snapshot.get("drain_start")
+    if snapshot["mode"] == "maintenance" and drain_from and drain_timeout:
+        if now < datetime.fromisoformat(drain_from) + timedelta(seconds=drain_timeout):
+            in_flight = in_flight_total()
+            if in_flight:
+                data.update(system_status="draining", in_flight=in_flight)
+
+    return data, 1
+
+
+def main():
+    data, exit_code = probe()
+    sys.stdout.write(json.dumps(data) + "\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
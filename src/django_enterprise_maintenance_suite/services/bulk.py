@@ -0,0 +1,265 @@
+import csv
+import json
+import re
+import uuid
+from datetime import datetime
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, router, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django_enterprise_maintenance_suite.models import (
+    MaintenanceState,
+    MaintenanceIgnoreURL,
+    MaintenanceAuditLog,
+)
+from django_enterprise_maintenance_suite.services.exceptions import ImportValidationError
+from django_enterprise_maintenance_suite.signals import prime_maintenance_cache
+
+CSV_FIELDS = [
+    'mode', 'reason', 'status', 'start_time', 'end_time', 'exceptions', 'read_only_rules',
+    'rollout_percentage', 'rollout_key', 'rollout_header',
+]
+
+# Windows that still occupy their slot in the calendar
+SCHEDULED_STATUSES = (MaintenanceState.Status.PENDING, MaintenanceState.Status.APPROVED)
+
+
+def export_windows(queryset):
+    """Serializes windows and their URL exemptions to plain dicts."""
+    rows = []
+    for window in queryset.prefetch_related('exceptions').order_by('start_time', 'pk'):
+        rows.append({
+            "mode": window.mode,
+            "reason": window.reason,
+            "status": window.status,
+            "start_time": window.start_time,
+            "end_time": window.end_time,
+            "exceptions": [
+                {"pattern": e.pattern, "description": e.description}
+                for e in window.exceptions.all()
+            ],
+            "read_only_rules": window.read_only_rules,
+            "rollout_percentage": window.rollout_percentage,
+            "rollout_key": window.rollout_key,
+            "rollout_header": window.rollout_header,
+        })
+    return rows
+
+
+def dump_rows(rows, stream, fmt):
+    if fmt == 'json':
+        json.dump(rows, stream, cls=DjangoJSONEncoder, indent=2)
+        return
+    writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({
+            **row,
+            "start_time": row["start_time"].isoformat() if row["start_time"] else "",
+            "end_time": row["end_time"].isoformat() if row["end_time"] else "",
+            "exceptions": json.dumps(row["exceptions"]),
+            "read_only_rules": json.dumps(row["read_only_rules"]),
+        })
+
+
+def load_rows(stream, fmt):
+    if fmt == 'json':
+        return json.load(stream)
+    rows = []
+    for row in csv.DictReader(stream):
+        row["exceptions"] = json.loads(row["exceptions"]) if row.get("exceptions") else []
+        row["read_only_rules"] = json.loads(row["read_only_rules"]) if row.get("read_only_rules") else []
+        rows.append(row)
+    return rows
+
+
+def _parse_time(value):
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    elif not isinstance(value, str):
+        raise ValueError(f"invalid datetime {value!r}")
+    else:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f"invalid datetime {value!r}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _model_errors(exc, prefix=""):
+    """Flattens a model ValidationError into 'field: message' strings."""
+    errors = []
+    for field, messages in exc.message_dict.items():
+        label = prefix if field == NON_FIELD_ERRORS else f"{prefix}{field}: "
+        errors.extend(label + message for message in messages)
+    return errors
+
+
+def _overlaps(start_a, end_a, start_b, end_b):
+    # Missing bounds are open-ended
+    return (end_b is None or start_a is None or start_a < end_b) and \
+        (end_a is None or start_b is None or start_b < end_a)
+
+
+def validate_rows(rows):
+    """
+    Validates every row in one pass, including overlaps with each other
+    and with scheduled windows. Each row is built into unsaved model
+    instances and checked with full_clean, so the model's own rules
+    (choices, lengths, clean()) apply. Returns the parsed rows or raises
+    ImportValidationError listing every problem.
+    """
+    errors = []
+    parsed = []
+
+    for index, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append(f"row {index}: expected an object, got {type(row).__name__}")
+            continue
+        row_errors = []
+        # created_by is set at import time; fields already reported are
+        # not validated twice
+        exclude = ["created_by"]
+        reason = row.get("reason") or ""
+        if not isinstance(reason, str):
+            row_errors.append("reason must be a string")
+            exclude.append("reason")
+            reason = ""
+        try:
+            start_time = _parse_time(row.get("start_time"))
+            end_time = _parse_time(row.get("end_time"))
+        except ValueError as exc:
+            row_errors.append(str(exc))
+            start_time = end_time = None
+
+        rollout_percentage = row.get("rollout_percentage")
+        window = MaintenanceState(
+            mode=row.get("mode") or MaintenanceState.Mode.MAINTENANCE,
+            reason=reason.strip(),
+            start_time=start_time,
+            end_time=end_time,
+            read_only_rules=row.get("read_only_rules") or [],
+            rollout_percentage=100 if rollout_percentage in (None, "") else rollout_percentage,
+            rollout_key=row.get("rollout_key") or MaintenanceState.RolloutKey.IP,
+            rollout_header=row.get("rollout_header") or "",
+        )
+        try:
+            window.full_clean(exclude=exclude)
+        except ValidationError as exc:
+            row_errors.extend(_model_errors(exc))
+
+        exceptions = row.get("exceptions") or []
+        if not isinstance(exceptions, list):
+            row_errors.append("exceptions must be a list")
+            exceptions = []
+        ignore_urls = []
+        for exception in exceptions:
+            pattern = exception.get("pattern") if isinstance(exception, dict) else None
+            if not isinstance(pattern, str):
+                row_errors.append("exception pattern must be a string")
+                continue
+            try:
+                re.compile(pattern.lstrip('/'))
+            except re.error as exc:
+                row_errors.append(f"invalid exception pattern: {exc}")
+                continue
+            ignore_url = MaintenanceIgnoreURL(pattern=pattern, description=exception.get("description") or "")
+            try:
+                ignore_url.full_clean(exclude=["maintenance_window"])
+            except ValidationError as exc:
+                row_errors.extend(_model_errors(exc, prefix="exception "))
+            ignore_urls.append(ignore_url)
+
+        if row_errors:
+            errors.extend(f"row {index}: {error}" for error in row_errors)
+            continue
+        parsed.append({
+            "row": index,
+            "window": window,
+            "exceptions": ignore_urls,
+            "start_time": window.start_time,
+            "end_time": window.end_time,
+        })
+
+    # Overlaps within the file: sweep by start time, comparing each row
+    # with every earlier row that has not ended yet
+    ordered = sorted(parsed, key=lambda r: (r["start_time"] is not None, r["start_time"] or 0))
+    open_rows = []
+    for current in ordered:
+        if current["start_time"] is not None:
+            open_rows = [
+                r for r in open_rows
+                if r["end_time"] is None or r["end_time"] > current["start_time"]
+            ]
+        for previous in open_rows:
+            if _overlaps(previous["start_time"], previous["end_time"], current["start_time"], current["end_time"]):
+                errors.append(f"row {current['row']}: overlaps row {previous['row']}")
+        open_rows.append(current)
+
+    # Overlaps with scheduled windows, fetched once for the whole import
+    if parsed:
+        starts = [r["start_time"] for r in parsed]
+        ends = [r["end_time"] for r in parsed]
+        existing = MaintenanceState.objects.filter(status__in=SCHEDULED_STATUSES)
+        if None not in ends:
+            existing = existing.exclude(start_time__gte=max(ends))
+        if None not in starts:
+            existing = existing.exclude(end_time__lte=min(starts))
+        existing = list(existing.only('pk', 'start_time', 'end_time'))
+        for row in parsed:
+            for window in existing:
+                if _overlaps(row["start_time"], row["end_time"], window.start_time, window.end_time):
+                    errors.append(f"row {row['row']}: overlaps existing window {window.pk}")
+
+    if errors:
+        raise ImportValidationError(errors)
+    return parsed
+
+
+def import_windows(rows, actor, ip=None):
+    """
+    Creates PENDING windows (and their exemptions) from validated rows in
+    a single transaction, with one audit batch and one cache refresh.
+    """
+    parsed = validate_rows(rows)
+    batch_id = uuid.uuid4().hex
+    windows = [row["window"] for row in parsed]
+    for window in windows:
+        window.created_by = actor
+
+    with transaction.atomic():
+        connection = connections[router.db_for_write(MaintenanceState)]
+        if connection.features.can_return_rows_from_bulk_insert:
+            MaintenanceState.objects.bulk_create(windows)
+        else:
+            # e.g. MySQL: bulk_create would leave the primary keys unset
+            for window in windows:
+                window.save()
+
+        ignore_urls = []
+        for window, row in zip(windows, parsed):
+            for ignore_url in row["exceptions"]:
+                ignore_url.maintenance_window = window
+                ignore_urls.append(ignore_url)
+        MaintenanceIgnoreURL.objects.bulk_create(ignore_urls)
+
+        MaintenanceAuditLog.objects.bulk_create([
+            MaintenanceAuditLog(
+                actor=actor,
+                action="CREATE",
+                maintenance_window=window,
+                window_snapshot=str(window),
+                payload={"source": "import", "batch": batch_id},
+                ip_address=ip,
+            )
+            for window in windows
+        ])
+
+        # bulk_create sends no post_save, so refresh the cache once here
+        transaction.on_commit(prime_maintenance_cache)
+
+    return windows
@@ -0,0 +1,134 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django_enterprise_maintenance_suite.models import DeferredRequest
+from django_enterprise_maintenance_suite.warmup import get_setting
+
+# META keys kept when spooling; everything else is rebuilt on replay
+SPOOLED_META_KEYS = ('CONTENT_TYPE', 'CONTENT_LENGTH')
+
+# Credentials are never written to the queue
+DROPPED_HEADERS = ('HTTP_COOKIE', 'HTTP_AUTHORIZATION', 'HTTP_PROXY_AUTHORIZATION')
+
+
+def spool_request(request, window):
+    """
+    Persists a write request so it can be replayed once the window ends.
+    """
+    dropped = set(DROPPED_HEADERS)
+    dropped.update(
+        'HTTP_' + name.upper().replace('-', '_')
+        for name in get_setting('READ_ONLY_DEFER_DROP_HEADERS', [])
+    )
+    headers = {
+        key: value
+        for key, value in request.META.items()
+        if (key.startswith('HTTP_') or key in SPOOLED_META_KEYS) and key not in dropped
+    }
+    return DeferredRequest.objects.create(
+        maintenance_window=window,
+        method=request.method,
+        path=request.path_info,
+        query_string=request.META.get('QUERY_STRING', ''),
+        headers=headers,
+        body=request.body,
+    )
+
+
+def _replay_one(handler, deferred):
+    environ = {
+        'REQUEST_METHOD': deferred.method,
+        'PATH_INFO': deferred.path,
+        'QUERY_STRING': deferred.query_string,
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'REMOTE_ADDR': '127.0.0.1',
+        'SCRIPT_NAME': '',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': BytesIO(bytes(deferred.body)),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    environ.update(deferred.headers)
+    environ['CONTENT_LENGTH'] = str(len(deferred.body))
+
+    captured = {}
+
+    def start_response(status, response_headers, exc_info=None):
+        captured['status'] = int(status.split(' ', 1)[0])
+
+    try:
+        response = handler(environ, start_response)
+        response.close()
+    finally:
+        # Worker threads own their connections; release them per request
+        connections.close_all()
+    return captured.get('status')
+
+
+def replay_pending(batch_size=100, concurrency=4):
+    """
+    Streams pending deferred requests back through the Django handler.
+    Requests are fetched in batches and replayed with bounded concurrency.
+    Yields (replayed, failed) counts per batch.
+    """
+    handler = WSGIHandler()
+
+    lease = timedelta(seconds=get_setting('READ_ONLY_REPLAY_LEASE', 300))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            # Claim the batch first so concurrent replays never share a row;
+            # the conditional update also holds on databases without row locks.
+            # Rows left REPLAYING by a crashed run are reclaimed once their
+            # lease expires.
+            with transaction.atomic():
+                now = timezone.now()
+                claimable = Q(status=DeferredRequest.Status.PENDING) | Q(
+                    status=DeferredRequest.Status.REPLAYING, claimed_at__lt=now - lease
+                )
+                candidates = list(
+                    DeferredRequest.objects
+                    .select_for_update(skip_locked=True)
+                    .filter(claimable)
+                    .order_by('pk')[:batch_size]
+                )
+                if not candidates:
+                    return
+                batch = [
+                    deferred for deferred in candidates
+                    if DeferredRequest.objects.filter(claimable, pk=deferred.pk).update(
+                        status=DeferredRequest.Status.REPLAYING, claimed_at=now
+                    )
+                ]
+            if not batch:
+                continue
+
+            statuses = list(executor.map(lambda d: _replay_one(handler, d), batch))
+
+            now = timezone.now()
+            replayed, failed = 0, 0
+            for deferred, status in zip(batch, statuses):
+                deferred.response_status = status
+                deferred.replayed_at = now
+                # Credentials are not spooled, so a 401/403 (or any other
+                # non-2xx) means the write did not happen
+                if status is not None and 200 <= status < 300:
+                    deferred.status = DeferredRequest.Status.REPLAYED
+                    replayed += 1
+                else:
+                    deferred.status = DeferredRequest.Status.FAILED
+                    failed += 1
+
+            DeferredRequest.objects.bulk_update(
+                batch, ['status', 'response_status', 'replayed_at']
+            )
+            yield replayed, failed
@@ -8,3 +8,11 @@ class InvalidTransitionError(MaintenanceError):
 
 class PermissionDeniedError(MaintenanceError):
     pass
+
+
+class ImportValidationError(MaintenanceError):
+    """Raised with every row error found while validating an import."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f"{len(errors)} invalid row(s) in import.")
@@ -3,6 +3,8 @@ from django.utils import timezone
 from django_enterprise_maintenance_suite.models import MaintenanceState
 from django_enterprise_maintenance_suite.services.exceptions import InvalidTransitionError
 from django_enterprise_maintenance_suite.services.audit import log_action
+from django_enterprise_maintenance_suite.services.outbox import enqueue_event
+from django_enterprise_maintenance_suite.services.reporting import record_downtime
 
 class MaintenanceService:
     """
@@ -29,6 +31,7 @@ class MaintenanceService:
                 payload={"status": "APPROVED"},
                 ip_address=ip,
             )
+            enqueue_event(event="APPROVE", window=window, actor=user)
 
         return window
 
@@ -94,6 +97,9 @@ class MaintenanceService:
             window.status = MaintenanceState.Status.ABORTED
             window.is_enabled = False
             window.save(update_fields=["status", "is_enabled"])
+            # Shadow windows never blocked anything, so they cost no downtime
+            if not window.is_shadow:
+                record_downtime(window)
 
             log_action(
                 actor=user,
@@ -102,6 +108,7 @@ class MaintenanceService:
                 payload={"status": "ABORTED"},
                 ip_address=ip,
             )
+            enqueue_event(event="ABORT", window=window, actor=user)
 
         return window
 
@@ -113,10 +120,13 @@ class MaintenanceService:
             )
 
         with transaction.atomic():
+            closed_at = timezone.now()
             window.status = MaintenanceState.Status.COMPLETED
             window.is_enabled = False
-            window.end_time = window.end_time or timezone.now()
+            window.end_time = window.end_time or closed_at
             window.save(update_fields=["status", "is_enabled", "end_time"])
+            if not window.is_shadow:
+                record_downtime(window, closed_at)
 
             log_action(
                 actor=user,
@@ -125,6 +135,47 @@ class MaintenanceService:
                 payload={"status": "COMPLETED"},
                 ip_address=ip,
             )
+            enqueue_event(event="COMPLETE", window=window, actor=user)
 
         return window
 
+    @staticmethod
+    def set_rollout(window: MaintenanceState, percentage, user, ip=None):
+        if window.status not in (
+            MaintenanceState.Status.PENDING,
+            MaintenanceState.Status.APPROVED,
+        ):
+            raise InvalidTransitionError(
+                "Only PENDING or APPROVED maintenance windows can be rolled out."
+            )
+
+        if not 0 <= percentage <= 100:
+            raise InvalidTransitionError(
+                "Rollout percentage must be between 0 and 100."
+            )
+
+        # A pending window may start at any share; once approved the cohort
+        # only grows, so nobody already in maintenance is flipped back.
+        if (
+            window.status == MaintenanceState.Status.APPROVED
+            and percentage < window.rollout_percentage
+        ):
+            raise InvalidTransitionError(
+                "Rollout percentage can only be raised; abort the window to roll back."
+            )
+
+        previous = window.rollout_percentage
+        with transaction.atomic():
+            window.rollout_percentage = percentage
+            window.save(update_fields=["rollout_percentage"])
+
+            log_action(
+                actor=user,
+                action="ROLLOUT",
+                window=window,
+                payload={"rollout_percentage": {"from": previous, "to": percentage}},
+                ip_address=ip,
+            )
+            enqueue_event(event="ROLLOUT", window=window, actor=user)
+
+        return window
@@ -0,0 +1,186 @@
+import json
+import logging
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from django_enterprise_maintenance_suite.models import MaintenanceOutboxEvent
+from django_enterprise_maintenance_suite.warmup import get_setting
+
+# Internal fan-out; receivers get event=, window_id= and payload=
+maintenance_event = Signal()
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_event(*, event, window, actor=None, payload=None):
+    """
+    Records a transition event, one outbox row per target. Must be called
+    inside the transition's transaction; the dispatcher is woken once that
+    transaction commits.
+    """
+    payload = {
+        "event": event,
+        "window_id": window.pk,
+        "mode": window.mode,
+        "status": window.status,
+        "reason": window.reason,
+        "start_time": window.start_time,
+        "end_time": window.end_time,
+        "actor": getattr(actor, 'username', None),
+        **(payload or {}),
+    }
+    targets = [""] + list(get_setting('WEBHOOK_URLS', []))
+    MaintenanceOutboxEvent.objects.bulk_create([
+        MaintenanceOutboxEvent(
+            event=event,
+            maintenance_window=window,
+            target=target,
+            payload=payload,
+        )
+        for target in targets
+    ])
+    transaction.on_commit(dispatcher.wake)
+
+
+def _deliver(url, body, timeout):
+    request = urllib.request.Request(
+        url,
+        data=body,
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+
+
+def _deliver_event(event):
+    """Delivers one outbox row to its webhook, or to internal receivers."""
+    try:
+        if event.target:
+            body = json.dumps(event.payload, cls=DjangoJSONEncoder).encode()
+            _deliver(event.target, body, get_setting('WEBHOOK_TIMEOUT', 5))
+        else:
+            maintenance_event.send(
+                sender=MaintenanceOutboxEvent,
+                event=event.event,
+                window_id=event.maintenance_window_id,
+                payload=event.payload,
+            )
+    except Exception as exc:
+        return str(exc) or exc.__class__.__name__
+    finally:
+        connections.close_all()
+    return None
+
+
+def _claim_batch(batch_size):
+    """
+    Claims due events by pushing next_attempt_at past a lease, in a short
+    transaction, so no lock is held while delivering. Events claimed by a
+    process that dies are picked up again once the lease expires.
+    """
+    lease = get_setting('OUTBOX_LEASE', 60)
+    with transaction.atomic():
+        now = timezone.now()
+        batch = list(
+            MaintenanceOutboxEvent.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                status=MaintenanceOutboxEvent.Status.PENDING,
+                next_attempt_at__lte=now,
+            )
+            .order_by('pk')[:batch_size]
+        )
+        if batch:
+            MaintenanceOutboxEvent.objects.filter(
+                pk__in=[event.pk for event in batch]
+            ).update(next_attempt_at=now + timedelta(seconds=lease))
+    return batch
+
+
+def dispatch_pending(batch_size=50, max_workers=4):
+    """
+    Delivers due outbox events in batches.
+    Failed deliveries are retried with exponential backoff until
+    OUTBOX_MAX_ATTEMPTS is reached. Returns (delivered, failed).
+    """
+    max_attempts = get_setting('OUTBOX_MAX_ATTEMPTS', 5)
+    backoff = get_setting('OUTBOX_BACKOFF', 10)
+    delivered, failed = 0, 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            batch = _claim_batch(batch_size)
+            if not batch:
+                return delivered, failed
+
+            errors = list(executor.map(_deliver_event, batch))
+
+            now = timezone.now()
+            for event, error in zip(batch, errors):
+                event.attempts += 1
+                if error is None:
+                    event.status = MaintenanceOutboxEvent.Status.DELIVERED
+                    event.delivered_at = now
+                    event.last_error = ""
+                    delivered += 1
+                    continue
+                event.last_error = error
+                if event.attempts >= max_attempts:
+                    event.status = MaintenanceOutboxEvent.Status.FAILED
+                    failed += 1
+                else:
+                    event.next_attempt_at = now + timedelta(
+                        seconds=backoff * 2 ** (event.attempts - 1)
+                    )
+
+            MaintenanceOutboxEvent.objects.bulk_update(
+                batch,
+                ['status', 'attempts', 'next_attempt_at', 'last_error', 'delivered_at'],
+            )
+
+
+class OutboxDispatcher:
+    """
+    Background thread delivering outbox events for this process.
+    Woken on transition commit and re-checks periodically for retries.
+    """
+
+    def __init__(self):
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def wake(self):
+        if not get_setting('OUTBOX_AUTO_DISPATCH', True):
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="maintenance-outbox", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def _run(self):
+        interval = get_setting('OUTBOX_POLL_INTERVAL', 30)
+        while True:
+            self._wakeup.wait(timeout=interval)
+            self._wakeup.clear()
+            try:
+                dispatch_pending(
+                    batch_size=get_setting('OUTBOX_BATCH_SIZE', 50),
+                    max_workers=get_setting('OUTBOX_WORKERS', 4),
+                )
+            except Exception:
+                logger.exception("Outbox dispatch failed")
+            finally:
+                connections.close_all()
+
+
+dispatcher = OutboxDispatcher()
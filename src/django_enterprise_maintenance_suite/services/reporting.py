@@ -0,0 +1,96 @@
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from django_enterprise_maintenance_suite.models import MaintenanceDowntimeRollup
+
+
+def split_by_day(start, end):
+    """
+    Splits [start, end) into (day, seconds) pieces on local-midnight
+    boundaries.
+    """
+    pieces = []
+    aware = timezone.is_aware(start)
+    if aware:
+        start, end = timezone.localtime(start), timezone.localtime(end)
+    while start < end:
+        next_midnight = datetime.combine(start.date() + timedelta(days=1), time.min)
+        if aware:
+            next_midnight = timezone.make_aware(next_midnight)
+        piece_end = min(next_midnight, end)
+        if aware:
+            # Same-zone aware datetimes subtract as wall-clock time; go
+            # through UTC so DST transition days get their real length
+            elapsed = piece_end.astimezone(dt_timezone.utc) - start.astimezone(dt_timezone.utc)
+        else:
+            elapsed = piece_end - start
+        pieces.append((start.date(), int(elapsed.total_seconds())))
+        start = piece_end
+    return pieces
+
+
+def record_downtime(window, closed_at=None):
+    """
+    Adds a closed window's effective interval to the daily rollup.
+    Must be called inside the transaction that closes the window.
+    """
+    closed_at = closed_at or timezone.now()
+    start = window.start_time or window.created_at
+    end = min(window.end_time, closed_at) if window.end_time else closed_at
+    if not start or end <= start:
+        return
+
+    for index, (day, seconds) in enumerate(split_by_day(start, end)):
+        increments = {
+            "seconds": F("seconds") + seconds,
+            # The window is counted once, on the day it started
+            "windows": F("windows") + (1 if index == 0 else 0),
+        }
+        updated = MaintenanceDowntimeRollup.objects.filter(
+            day=day, mode=window.mode
+        ).update(**increments)
+        if updated:
+            continue
+        try:
+            with transaction.atomic():
+                MaintenanceDowntimeRollup.objects.create(
+                    day=day,
+                    mode=window.mode,
+                    seconds=seconds,
+                    windows=1 if index == 0 else 0,
+                )
+        except IntegrityError:
+            # Another closer created the row first
+            MaintenanceDowntimeRollup.objects.filter(
+                day=day, mode=window.mode
+            ).update(**increments)
+
+
+def downtime_report(start_date=None, end_date=None):
+    """
+    Monthly downtime minutes per mode, read straight from the rollup.
+    Returns {"YYYY-MM": {mode: {"minutes": float, "windows": int}}}.
+    """
+    rows = MaintenanceDowntimeRollup.objects.all()
+    if start_date:
+        rows = rows.filter(day__gte=start_date)
+    if end_date:
+        rows = rows.filter(day__lte=end_date)
+
+    rows = (
+        rows.annotate(month=TruncMonth('day'))
+        .values('month', 'mode')
+        .annotate(total_seconds=Sum('seconds'), total_windows=Sum('windows'))
+        .order_by('month', 'mode')
+    )
+
+    report = {}
+    for row in rows:
+        month = row['month'].strftime('%Y-%m')
+        report.setdefault(month, {})[row['mode']] = {
+            "minutes": round(row['total_seconds'] / 60, 2),
+            "windows": row['total_windows'],
+        }
+    return report
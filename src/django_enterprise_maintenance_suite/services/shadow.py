@@ -0,0 +1,38 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django_enterprise_maintenance_suite.models import ShadowDecisionCount
+
+
+def store_counts(counts):
+    """Adds {(window_id, path_prefix, method): count} to the stored totals."""
+    for (window_id, path_prefix, method), count in counts.items():
+        rows = ShadowDecisionCount.objects.filter(
+            maintenance_window_id=window_id, path_prefix=path_prefix, method=method
+        )
+        if rows.update(count=F('count') + count):
+            continue
+        try:
+            with transaction.atomic():
+                ShadowDecisionCount.objects.create(
+                    maintenance_window_id=window_id,
+                    path_prefix=path_prefix,
+                    method=method,
+                    count=count,
+                )
+        except IntegrityError:
+            # Another process created the row first
+            rows.update(count=F('count') + count)
+
+
+def shadow_report(window):
+    """Would-block counts for a shadow window, per path prefix and per method."""
+    rows = ShadowDecisionCount.objects.filter(maintenance_window=window)
+    return {
+        "total": rows.aggregate(total=Sum('count'))['total'] or 0,
+        "by_prefix": list(
+            rows.values('path_prefix').annotate(count=Sum('count')).order_by('-count')
+        ),
+        "by_method": list(
+            rows.values('method').annotate(count=Sum('count')).order_by('-count')
+        ),
+    }
@@ -0,0 +1,69 @@
+import logging
+import random
+import threading
+import time
+from django.db import connections
+from django_enterprise_maintenance_suite.warmup import get_setting
+
+OTHER_PREFIX = "(other)"
+
+logger = logging.getLogger(__name__)
+
+
+class ShadowAggregator:
+    """
+    Sampled, bounded in-memory counter of would-block decisions.
+    Only sampled hits touch the dict; a background thread writes the
+    counts to ShadowDecisionCount every flush interval, whether or not
+    more traffic arrives.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._flusher = None
+
+    def record(self, window_id, path, method):
+        rate = get_setting('SHADOW_SAMPLE_RATE', 1.0)
+        if rate < 1.0 and random.random() >= rate:
+            return
+
+        depth = get_setting('SHADOW_PREFIX_DEPTH', 1)
+        prefix = "/" + "/".join(path.lstrip('/').split('/', depth)[:depth])
+        key = (window_id, prefix, method)
+
+        with self._lock:
+            if key not in self._counts and len(self._counts) >= get_setting('SHADOW_MAX_KEYS', 1000):
+                key = (window_id, OTHER_PREFIX, method)
+            self._counts[key] = self._counts.get(key, 0) + 1
+            # Started lazily; a forked worker starts its own
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(
+                    target=self._run, name="maintenance-shadow", daemon=True
+                )
+                self._flusher.start()
+
+    def _run(self):
+        while True:
+            time.sleep(get_setting('SHADOW_FLUSH_INTERVAL', 30))
+            self.flush()
+
+    def flush(self):
+        """Writes the counts gathered so far to the database."""
+        from django_enterprise_maintenance_suite.services.shadow import store_counts
+
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        if not counts:
+            return
+        rate = get_setting('SHADOW_SAMPLE_RATE', 1.0)
+        try:
+            # Scale sampled hits back up to an estimate of real traffic
+            store_counts({key: round(count / rate) for key, count in counts.items()})
+        except Exception:
+            logger.exception("Could not store shadow decision counts")
+        finally:
+            connections.close_all()
+
+
+aggregator = ShadowAggregator()
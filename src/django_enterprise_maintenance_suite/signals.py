@@ -1,9 +1,36 @@
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.cache import cache
-from django_enterprise_maintenance_suite.models import MaintenanceState, MaintenanceIgnoreURL, MAINTENANCE_CACHE_KEY
+from django_enterprise_maintenance_suite.models import MaintenanceState, MaintenanceIgnoreURL, MAINTENANCE_CACHE_KEY, MAINTENANCE_CACHE_TIMEOUT
+from django_enterprise_maintenance_suite.feed import bump_status_version
+from django_enterprise_maintenance_suite.probe import cache_snapshot
+
+
+def prime_maintenance_cache():
+    """
+    Writes the current active-window snapshot into the cache.
+    False is stored when no window is active so readers can tell it from a miss.
+    """
+    current_state = MaintenanceState.objects.current_window()
+    if current_state:
+        # Computed before pickling so every reader gets it for free
+        current_state.version
+    cache.set(MAINTENANCE_CACHE_KEY, current_state or False, timeout=MAINTENANCE_CACHE_TIMEOUT)
+    cache_snapshot(current_state)
+    bump_status_version()
+
+
+def _prime_on_commit(using):
+    connection = transaction.get_connection(using)
+    # Coalesce every change made in one transaction into a single write;
+    # the queue is emptied on rollback, so nothing stale is left behind.
+    if any(entry[1] is prime_maintenance_cache for entry in connection.run_on_commit):
+        return
+    transaction.on_commit(prime_maintenance_cache, using=using)
+
 
 @receiver([post_save, post_delete], sender=MaintenanceState)
 @receiver([post_save, post_delete], sender=MaintenanceIgnoreURL)
-def clear_maintenance_cache(**kwargs):
-    cache.delete(MAINTENANCE_CACHE_KEY)
\ No newline at end of file
+def clear_maintenance_cache(using=None, **kwargs):
+    _prime_on_commit(using)
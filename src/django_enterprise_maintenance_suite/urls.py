@@ -1,6 +1,8 @@
 from django.urls import path
-from django_enterprise_maintenance_suite.views import maintenance_status_view
+from django_enterprise_maintenance_suite.views import maintenance_status_view, maintenance_feed_view, maintenance_report_view
 
 urlpatterns = [
     path('maintenance/status/', maintenance_status_view, name='maintenance_status'),
+    path('maintenance/status/feed/', maintenance_feed_view, name='maintenance_status_feed'),
+    path('maintenance/report/', maintenance_report_view, name='maintenance_report'),
 ]
\ No newline at end of file
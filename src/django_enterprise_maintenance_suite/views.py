@@ -1,19 +1,29 @@
-from django.http import JsonResponse
+import json
+import time
+from datetime import date
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
 from django.utils import timezone
 from django.views.decorators.cache import cache_control
 from django.views.decorators.http import require_GET
 from django_enterprise_maintenance_suite.models import MaintenanceState
+from django_enterprise_maintenance_suite.drain import drain_status
+from django_enterprise_maintenance_suite.feed import VersionWatcher
+from django_enterprise_maintenance_suite.services.reporting import downtime_report
+from django_enterprise_maintenance_suite.warmup import get_setting
 
-@require_GET
-@cache_control(max_age=60, public=True)
-def maintenance_status_view(request):
+
+def get_status_payload():
     """
-    Public endpoint to check system health.
-    Returns 200 OK with JSON describing the current state.
+    Builds the public status document.
+    Returns (data, next_boundary) where next_boundary is the next scheduled
+    start/end at which the document changes without any write.
     """
     # 1. Check for active, approved maintenance
     active = MaintenanceState.objects.filter(
         is_enabled=True,
+        is_shadow=False,
         status=MaintenanceState.Status.APPROVED
     ).order_by('-created_at').first()
 
@@ -22,21 +32,43 @@ def maintenance_status_view(request):
         "timestamp": timezone.now().isoformat(),
         "maintenance_window": None
     }
+    next_boundary = None
 
     # 2. Validation Logic (Must match Middleware logic)
     if active:
         now = timezone.now()
         start_ok = not active.start_time or now >= active.start_time
         end_ok = not active.end_time or now <= active.end_time
-        
+
+        if not start_ok:
+            next_boundary = active.start_time
+        elif end_ok:
+            next_boundary = active.end_time
+
         if start_ok and end_ok:
             data["system_status"] = active.mode
             data["maintenance_window"] = {
+                "mode": active.mode,
                 "reason": active.reason,
                 "start_time": active.start_time,
                 "end_time": active.end_time,
-                "expected_duration_remaining": None 
+                "expected_duration_remaining": None,
+                "in_flight": None,
+                "rollout_percentage": active.rollout_percentage,
             }
+
+            # This document is shared by every client (and cached publicly),
+            # so a partial rollout is reported as such rather than as the mode
+            # only the clients inside the cohort see.
+            if active.rollout_percentage < 100:
+                data["system_status"] = "partial"
+
+            # A starting MAINTENANCE window reports 'draining' until the
+            # requests already in flight finish or the drain times out.
+            in_flight = drain_status(active, now) if active.rollout_percentage >= 100 else None
+            if in_flight:
+                data["system_status"] = "draining"
+                data["maintenance_window"]["in_flight"] = in_flight
             
             # Optional: Calculate remaining time for UI countdowns
             if active.end_time:
@@ -44,4 +76,104 @@ def maintenance_status_view(request):
                 if remaining > 0:
                     data["maintenance_window"]["expected_duration_remaining"] = remaining
 
-    return JsonResponse(data)
\ No newline at end of file
+    return data, next_boundary
+
+
+@require_GET
+@cache_control(max_age=60, public=True)
+def maintenance_status_view(request):
+    """
+    Public endpoint to check system health.
+    Returns 200 OK with JSON describing the current state.
+    """
+    data, _ = get_status_payload()
+    return JsonResponse(data)
+
+
+@require_GET
+def maintenance_report_view(request):
+    """
+    Staff-only SLA report: monthly downtime minutes per mode.
+    Accepts optional ?from=YYYY-MM-DD&to=YYYY-MM-DD.
+    """
+    if not request.user.is_staff:
+        return JsonResponse({"error": "Forbidden"}, status=403)
+
+    try:
+        start_date = date.fromisoformat(request.GET['from']) if request.GET.get('from') else None
+        end_date = date.fromisoformat(request.GET['to']) if request.GET.get('to') else None
+    except ValueError:
+        return JsonResponse({"error": "Dates must be YYYY-MM-DD."}, status=400)
+
+    return JsonResponse({"report": downtime_report(start_date, end_date)})
+
+
+watcher = VersionWatcher(get_status_payload)
+
+
+def _sse_event(version, payload):
+    return f"id: {version}\nevent: status\ndata: {json.dumps(payload, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def _sse_stream(known_version):
+    heartbeat = get_setting('FEED_HEARTBEAT', 15)
+    # Streams are recycled so a connection never lives forever; the
+    # browser reconnects with Last-Event-ID and misses nothing.
+    deadline = time.monotonic() + get_setting('FEED_SSE_MAX_AGE', 300)
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        change = await watcher.wait_for_change(known_version, min(heartbeat, remaining))
+        if change is None:
+            # Comment line keeps proxies from closing an idle stream
+            yield ": keep-alive\n\n"
+            continue
+        known_version, payload = change
+        yield _sse_event(known_version, payload)
+
+
+async def maintenance_feed_view(request):
+    """
+    Change feed for the status document.
+    Clients send the last version they saw (If-None-Match, Last-Event-ID or
+    ?version=) and are only answered once the maintenance state changes.
+    Serves Server-Sent Events for 'Accept: text/event-stream', long-poll otherwise.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    known_version = (
+        request.headers.get('Last-Event-ID')
+        or request.headers.get('If-None-Match', '').strip('"')
+        or request.GET.get('version')
+    )
+
+    wants_sse = 'text/event-stream' in request.headers.get('Accept', '')
+    if wants_sse and isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(_sse_stream(known_version), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    change = await watcher.wait_for_change(known_version, get_setting('FEED_LONG_POLL_TIMEOUT', 25))
+
+    if wants_sse:
+        # WSGI cannot stream an async generator without buffering it
+        # forever, so each SSE request is answered like a long-poll: one
+        # event (or a keep-alive) and the browser reconnects right away.
+        body = "retry: 0\n\n" + (": keep-alive\n\n" if change is None else _sse_event(*change))
+        response = HttpResponse(body, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    if change is None:
+        response = HttpResponse(status=304)
+        response['ETag'] = f'"{known_version}"'
+        return response
+
+    version, payload = change
+    response = JsonResponse(payload)
+    response['ETag'] = f'"{version}"'
+    response['Cache-Control'] = 'no-cache'
+    return response
@@ -0,0 +1,84 @@
+import logging
+import re
+import time
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.utils.module_loading import import_string
+from django_enterprise_maintenance_suite.policy import validate_rules
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = 'django_enterprise_maintenance_suite.backends.DefaultMaintenanceBackend'
+
+PATTERN_SETTINGS = ('IGNORE_URL_PATTERNS', 'READ_ONLY_DEFER_URL_PATTERNS')
+NUMERIC_SETTINGS = (
+    'DRAIN_TIMEOUT', 'BYPASS_COOKIE_AGE', 'FEED_POLL_INTERVAL', 'FEED_HEARTBEAT',
+    'FEED_LONG_POLL_TIMEOUT', 'FEED_SSE_MAX_AGE', 'READ_ONLY_REPLAY_LEASE',
+)
+
+
+def get_setting(name, default=None):
+    """Reads one MAINTENANCE_SUITE entry."""
+    return getattr(settings, 'MAINTENANCE_SUITE', {}).get(name, default)
+
+
+def validate_settings():
+    """
+    Checks MAINTENANCE_SUITE so misconfiguration fails at startup
+    instead of on the first request.
+    """
+    conf = getattr(settings, 'MAINTENANCE_SUITE', {})
+    if not isinstance(conf, dict):
+        raise ImproperlyConfigured("MAINTENANCE_SUITE must be a dict.")
+
+    for name in PATTERN_SETTINGS:
+        for pattern in conf.get(name, []):
+            try:
+                re.compile(pattern.lstrip('/'))
+            except (re.error, AttributeError) as exc:
+                raise ImproperlyConfigured(
+                    f"MAINTENANCE_SUITE['{name}'] contains an invalid pattern {pattern!r}: {exc}"
+                )
+
+    methods = conf.get('READ_ONLY_ALLOWED_METHODS', [])
+    if isinstance(methods, str) or not all(isinstance(m, str) for m in methods):
+        raise ImproperlyConfigured(
+            "MAINTENANCE_SUITE['READ_ONLY_ALLOWED_METHODS'] must be a list of HTTP methods."
+        )
+
+    try:
+        validate_rules(conf.get('READ_ONLY_POLICY', []))
+    except ValidationError as exc:
+        raise ImproperlyConfigured(f"MAINTENANCE_SUITE['READ_ONLY_POLICY'] is invalid: {exc.message}")
+
+    for name in NUMERIC_SETTINGS:
+        value = conf.get(name, 0)
+        if not isinstance(value, (int, float)) or value < 0:
+            raise ImproperlyConfigured(
+                f"MAINTENANCE_SUITE['{name}'] must be a non-negative number."
+            )
+    return conf
+
+
+def load_backend_class():
+    path = get_setting('BACKEND', DEFAULT_BACKEND)
+    try:
+        return import_string(path)
+    except ImportError as exc:
+        raise ImproperlyConfigured(
+            f"MAINTENANCE_SUITE['BACKEND'] could not be imported: {exc}"
+        )
+
+
+def warm_up(backend):
+    """
+    Prepares a backend instance for traffic (URL resolution, state
+    snapshot) and reports how long it took.
+    """
+    started = time.perf_counter()
+    warm = getattr(backend, 'warm_up', None)
+    if warm is not None:
+        warm()
+    elapsed = (time.perf_counter() - started) * 1000
+    logger.info("Maintenance suite warm-up finished in %.1f ms", elapsed)
+    return elapsed
@@ -0,0 +1,107 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from django_enterprise_maintenance_suite.models import MaintenanceIgnoreURL
+from django_enterprise_maintenance_suite.services.bulk import import_windows, validate_rows
+from django_enterprise_maintenance_suite.services.exceptions import ImportValidationError
+
+
+class ValidateRowsTests(TestCase):
+    def assertRowErrors(self, rows, expected):
+        with self.assertRaises(ImportValidationError) as ctx:
+            validate_rows(rows)
+        self.assertEqual(ctx.exception.errors, expected)
+
+    def test_malformed_rows_are_reported(self):
+        self.assertRowErrors(
+            [
+                ["not", "an", "object"],
+                {"reason": 42},
+                {"reason": "Upgrade", "start_time": 1700000000},
+                {"reason": "Upgrade", "exceptions": [{"pattern": 5}]},
+            ],
+            [
+                "row 1: expected an object, got list",
+                "row 2: reason must be a string",
+                "row 3: invalid datetime 1700000000",
+                "row 4: exception pattern must be a string",
+            ],
+        )
+
+    def test_every_overlap_is_listed(self):
+        # Row 1 spans the others, which do not touch each other
+        self.assertRowErrors(
+            [
+                {"reason": "Long", "start_time": "2030-01-01T00:00:00Z", "end_time": "2030-01-01T10:00:00Z"},
+                {"reason": "A", "start_time": "2030-01-01T01:00:00Z", "end_time": "2030-01-01T02:00:00Z"},
+                {"reason": "B", "start_time": "2030-01-01T03:00:00Z", "end_time": "2030-01-01T04:00:00Z"},
+                {"reason": "Later", "start_time": "2030-01-02T00:00:00Z", "end_time": "2030-01-02T01:00:00Z"},
+            ],
+            [
+                "row 2: overlaps row 1",
+                "row 3: overlaps row 1",
+            ],
+        )
+
+    def test_rollout_fields(self):
+        [row] = validate_rows([{"reason": "Canary", "rollout_percentage": "5", "rollout_key": "session"}])
+        self.assertEqual((row["window"].rollout_percentage, row["window"].rollout_key), (5, "session"))
+        self.assertRowErrors(
+            [
+                {"reason": "A", "rollout_percentage": 150},
+                {"reason": "B", "rollout_key": "header"},
+            ],
+            [
+                "row 1: rollout_percentage: Ensure this value is less than or equal to 100.",
+                "row 2: A rollout header is required when hashing by header.",
+            ],
+        )
+
+    def test_model_field_limits_apply(self):
+        self.assertRowErrors(
+            [
+                {"reason": "A", "exceptions": [{"pattern": "^api/", "description": "x" * 300}]},
+                {"reason": "B", "rollout_key": "header", "rollout_header": "X" * 101},
+                {"reason": "C", "mode": "outage"},
+            ],
+            [
+                "row 1: exception description: Ensure this value has at most 100 characters (it has 300).",
+                "row 2: rollout_header: Ensure this value has at most 100 characters (it has 101).",
+                "row 3: mode: Value 'outage' is not a valid choice.",
+            ],
+        )
+
+
+class ImportWindowsTests(TestCase):
+    def import_rows(self):
+        actor = get_user_model().objects.create(username="ops")
+        return import_windows(
+            [
+                {"reason": "A", "start_time": "2030-01-01T00:00:00Z", "end_time": "2030-01-01T01:00:00Z",
+                 "exceptions": [{"pattern": "^health/"}]},
+                {"reason": "B", "start_time": "2030-01-02T00:00:00Z", "end_time": "2030-01-02T01:00:00Z",
+                 "rollout_percentage": 5},
+            ],
+            actor,
+        )
+
+    def assertImported(self, windows):
+        self.assertEqual([w.reason for w in windows], ["A", "B"])
+        self.assertTrue(all(w.pk for w in windows))
+        self.assertEqual(windows[1].rollout_percentage, 5)
+        self.assertEqual(
+            list(MaintenanceIgnoreURL.objects.values_list("maintenance_window", "pattern")),
+            [(windows[0].pk, "^health/")],
+        )
+
+    def test_import_creates_windows_and_exemptions(self):
+        self.assertImported(self.import_rows())
+
+    def test_import_without_bulk_insert_primary_keys(self):
+        features = type(connection.features)
+        with mock.patch.object(features, "can_return_rows_from_bulk_insert", new_callable=mock.PropertyMock) as can_return:
+            can_return.return_value = False
+            self.assertImported(self.import_rows())
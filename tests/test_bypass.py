@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.utils import timezone
+
+from django_enterprise_maintenance_suite.models import MaintenanceState
+
+BYPASS = {"OUTBOX_AUTO_DISPATCH": False, "BYPASS_TOKEN": "s3cret"}
+
+
+class BypassCookieTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.window = MaintenanceState.objects.create(
+            reason="Deploy",
+            created_by=get_user_model().objects.create(username="ops"),
+            status=MaintenanceState.Status.APPROVED,
+            is_enabled=True,
+        )
+
+    def client_with_session(self):
+        client = Client()
+        session = client.session
+        session["seen"] = True
+        session.save()
+        return client
+
+    def bypass(self):
+        client = self.client_with_session()
+        response = client.get("/hello/", {"maintenance_bypass": "s3cret"})
+        self.assertEqual(response.status_code, 200)
+        return client, response.cookies["maintenance_bypass"].value
+
+    def test_cookie_lets_the_same_session_through(self):
+        with self.settings(MAINTENANCE_SUITE=BYPASS):
+            client, _ = self.bypass()
+            self.assertEqual(client.get("/hello/").status_code, 200)
+
+    def test_cookie_is_bound_to_the_session(self):
+        with self.settings(MAINTENANCE_SUITE=BYPASS):
+            _, cookie = self.bypass()
+            other = self.client_with_session()
+            other.cookies["maintenance_bypass"] = cookie
+            self.assertEqual(other.get("/hello/").status_code, 503)
+
+    def test_cookie_expires_with_the_window_version(self):
+        with self.settings(MAINTENANCE_SUITE=BYPASS):
+            client, _ = self.bypass()
+            self.window.end_time = timezone.now() + timedelta(hours=2)
+            self.window.save()
+            cache.clear()
+            self.assertEqual(client.get("/hello/").status_code, 503)
@@ -0,0 +1,67 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+
+from django_enterprise_maintenance_suite.backends import DefaultMaintenanceBackend
+from django_enterprise_maintenance_suite.models import MAINTENANCE_CACHE_KEY, MaintenanceIgnoreURL, MaintenanceState
+
+
+class PrimeOnCommitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create(username="ops")
+
+    def test_changes_in_one_transaction_prime_once(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                window = MaintenanceState.objects.create(
+                    reason="Deploy",
+                    created_by=self.user,
+                    status=MaintenanceState.Status.APPROVED,
+                    is_enabled=True,
+                )
+                MaintenanceIgnoreURL.objects.create(maintenance_window=window, pattern=r"^health/")
+                window.save()
+
+        self.assertEqual([callback.__name__ for callback in callbacks], ["prime_maintenance_cache"])
+        cached = cache.get(MAINTENANCE_CACHE_KEY)
+        self.assertEqual(cached.pk, window.pk)
+        self.assertEqual(cached.version, window.version)
+
+    def test_rollback_leaves_the_cache_alone(self):
+        cache.set(MAINTENANCE_CACHE_KEY, False)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    MaintenanceState.objects.create(reason="Deploy", created_by=self.user)
+                    raise RuntimeError
+        self.assertEqual(callbacks, [])
+        self.assertIs(cache.get(MAINTENANCE_CACHE_KEY), False)
+
+
+class CacheMissTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_miss_does_not_overwrite_a_primed_snapshot(self):
+        window = MaintenanceState.objects.create(
+            reason="Deploy",
+            created_by=get_user_model().objects.create(username="ops"),
+            status=MaintenanceState.Status.APPROVED,
+            is_enabled=True,
+        )
+        backend = DefaultMaintenanceBackend()
+        current_window = MaintenanceState.objects.current_window
+
+        def read_then_commit_elsewhere():
+            # The reader saw no window; a transition commits and primes
+            # the cache before the reader stores its result.
+            cache.set(MAINTENANCE_CACHE_KEY, current_window())
+            return None
+
+        with mock.patch.object(MaintenanceState.objects, "current_window", read_then_commit_elsewhere):
+            self.assertIsNone(backend._get_state())
+        self.assertEqual(cache.get(MAINTENANCE_CACHE_KEY).pk, window.pk)
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.utils import timezone
+
+from django_enterprise_maintenance_suite.models import DeferredRequest
+from django_enterprise_maintenance_suite.services.deferral import replay_pending, spool_request
+
+Status = DeferredRequest.Status
+
+
+class SpoolTests(TestCase):
+    def test_credentials_are_not_stored(self):
+        request = RequestFactory().post(
+            "/webhooks/stripe/",
+            data=b"{}",
+            content_type="application/json",
+            HTTP_COOKIE="sessionid=abc",
+            HTTP_AUTHORIZATION="Bearer token",
+            HTTP_X_SIGNATURE="sig",
+        )
+        deferred = spool_request(request, None)
+        self.assertEqual(deferred.headers["HTTP_X_SIGNATURE"], "sig")
+        self.assertNotIn("HTTP_COOKIE", deferred.headers)
+        self.assertNotIn("HTTP_AUTHORIZATION", deferred.headers)
+
+
+class ReplayTests(TransactionTestCase):
+    # Replays run on worker threads with their own connections, so the
+    # rows must be committed.
+
+    def setUp(self):
+        # Replays go through the middleware; a window cached by an earlier
+        # test would answer them with 503.
+        cache.clear()
+
+    def defer(self, path, **kwargs):
+        return DeferredRequest.objects.create(method="POST", path=path, body=b"", **kwargs)
+
+    def replay(self):
+        with self.settings(MAINTENANCE_SUITE={"OUTBOX_AUTO_DISPATCH": False, "READ_ONLY_REPLAY_LEASE": 60}):
+            return list(replay_pending(batch_size=10, concurrency=2))
+
+    def test_only_2xx_counts_as_replayed(self):
+        ok = self.defer("/hello/")
+        missing = self.defer("/missing/")
+        self.assertEqual(self.replay(), [(1, 1)])
+
+        ok.refresh_from_db()
+        missing.refresh_from_db()
+        self.assertEqual((ok.status, ok.response_status), (Status.REPLAYED, 200))
+        self.assertEqual((missing.status, missing.response_status), (Status.FAILED, 404))
+
+    def test_stale_claims_are_reclaimed(self):
+        now = timezone.now()
+        stale = self.defer("/hello/", status=Status.REPLAYING, claimed_at=now - timedelta(minutes=5))
+        fresh = self.defer("/hello/", status=Status.REPLAYING, claimed_at=now)
+        self.assertEqual(self.replay(), [(1, 0)])
+
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.status, Status.REPLAYED)
+        self.assertEqual(fresh.status, Status.REPLAYING)
+
+    def test_replayed_rows_are_not_claimed_again(self):
+        self.defer("/hello/")
+        self.assertEqual(self.replay(), [(1, 0)])
+        self.assertEqual(self.replay(), [])
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+from django.core.cache import cache
+from django.test import AsyncClient, SimpleTestCase, TestCase
+
+from django_enterprise_maintenance_suite.feed import VersionWatcher, bump_status_version
+
+
+class VersionWatcherTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.status = "operational"
+        self.watcher = VersionWatcher(lambda: ({"system_status": self.status}, None))
+
+    def test_change_wakes_waiters_on_other_loops(self):
+        # Long poll interval: only the cross-loop wake-up can answer in time
+        with self.settings(MAINTENANCE_SUITE={"FEED_POLL_INTERVAL": 60}):
+            known, _ = asyncio.run(self.watcher.current())
+            results = []
+
+            def wait():
+                results.append(asyncio.run(self.watcher.wait_for_change(known, 10)))
+
+            threads = [threading.Thread(target=wait) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            while len(self.watcher._loops) < 2:
+                threading.Event().wait(0.01)
+
+            self.status = "maintenance"
+            bump_status_version()
+            asyncio.run(self.watcher.current())
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(len(results), 2)
+        for version, payload in results:
+            self.assertNotEqual(version, known)
+            self.assertEqual(payload, {"system_status": "maintenance"})
+        self.assertEqual(self.watcher._loops, {})
+
+    def test_timeout_returns_none(self):
+        with self.settings(MAINTENANCE_SUITE={"FEED_POLL_INTERVAL": 60}):
+            known, _ = asyncio.run(self.watcher.current())
+            self.assertIsNone(asyncio.run(self.watcher.wait_for_change(known, 0.05)))
+
+
+class FeedViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_wsgi_sse_request_gets_one_event(self):
+        response = self.client.get("/maintenance/status/feed/", HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertTrue(response.content.startswith(b"retry: 0\n\nid: "))
+
+    async def test_asgi_sse_stream_is_closed_at_max_age(self):
+        suite = {"OUTBOX_AUTO_DISPATCH": False, "FEED_HEARTBEAT": 0.05, "FEED_SSE_MAX_AGE": 0.2}
+        with self.settings(MAINTENANCE_SUITE=suite):
+            response = await AsyncClient().get("/maintenance/status/feed/", ACCEPT="text/event-stream")
+            self.assertTrue(response.streaming)
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertTrue(chunks[0].startswith(b"id: "))
+        self.assertIn(b": keep-alive\n\n", chunks[1:])
@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from django_enterprise_maintenance_suite.models import MaintenanceState
+
+
+class LegacyBackend:
+    """Custom backend written against the original two-method interface."""
+
+    def get_maintenance_window(self, request):
+        return MaintenanceState.objects.current_window()
+
+    def is_write_method(self, request):
+        return request.method not in ("GET", "HEAD")
+
+
+class CustomBackendTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create(username="ops")
+        MaintenanceState.objects.create(
+            mode=MaintenanceState.Mode.READ_ONLY,
+            reason="Migration",
+            created_by=user,
+            start_time=timezone.now(),
+            status=MaintenanceState.Status.APPROVED,
+            is_enabled=True,
+        )
+
+    def test_backend_without_optional_hooks(self):
+        suite = {"OUTBOX_AUTO_DISPATCH": False, "BACKEND": "tests.test_middleware.LegacyBackend"}
+        with self.settings(MAINTENANCE_SUITE=suite):
+            self.assertEqual(self.client.get("/hello/").status_code, 200)
+            self.assertEqual(self.client.post("/hello/").status_code, 403)
@@ -0,0 +1,122 @@
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import TestCase
+from django.utils import timezone
+
+from django_enterprise_maintenance_suite.models import MaintenanceOutboxEvent, MaintenanceState
+from django_enterprise_maintenance_suite.services.maintenance import MaintenanceService
+from django_enterprise_maintenance_suite.services.outbox import dispatch_pending, maintenance_event
+
+
+class StubWebhookServer:
+    """Records every POST; paths listed in failing answer 500."""
+
+    def __init__(self):
+        self.received = []
+        self.failing = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stub.received.append((self.path, json.loads(body)))
+                self.send_response(500 if self.path in stub.failing else 200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_port}{path}"
+
+    def hits(self, path):
+        return [payload for received_path, payload in self.received if received_path == path]
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class OutboxDeliveryTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="ops")
+        now = timezone.now()
+        self.window = MaintenanceState.objects.create(
+            reason="Database upgrade",
+            created_by=self.user,
+            start_time=now + timedelta(hours=1),
+            end_time=now + timedelta(hours=2),
+        )
+
+    def approve(self, urls):
+        suite = {"OUTBOX_AUTO_DISPATCH": False, "WEBHOOK_URLS": urls}
+        with self.settings(MAINTENANCE_SUITE=suite):
+            MaintenanceService.approve(self.window, self.user)
+
+    def test_approve_delivers_to_webhook_and_signal(self):
+        received = []
+
+        def receiver(sender, event, window_id, payload, **kwargs):
+            received.append((event, window_id))
+
+        maintenance_event.connect(receiver)
+        self.addCleanup(maintenance_event.disconnect, receiver)
+
+        with StubWebhookServer() as stub:
+            self.approve([stub.url("/hook/")])
+            self.assertEqual(MaintenanceOutboxEvent.objects.count(), 2)
+
+            self.assertEqual(dispatch_pending(), (2, 0))
+
+        [payload] = stub.hits("/hook/")
+        self.assertEqual(payload["event"], "APPROVE")
+        self.assertEqual(payload["window_id"], self.window.pk)
+        self.assertEqual(payload["start_time"], DjangoJSONEncoder().default(self.window.start_time))
+        self.assertEqual(received, [("APPROVE", self.window.pk)])
+        self.assertFalse(
+            MaintenanceOutboxEvent.objects
+            .exclude(status=MaintenanceOutboxEvent.Status.DELIVERED)
+            .exists()
+        )
+
+    def test_retry_only_repeats_failed_webhook(self):
+        with StubWebhookServer() as stub:
+            stub.failing.add("/flaky/")
+            self.approve([stub.url("/ok/"), stub.url("/flaky/")])
+
+            self.assertEqual(dispatch_pending(), (2, 0))
+            flaky = MaintenanceOutboxEvent.objects.get(target=stub.url("/flaky/"))
+            self.assertEqual(flaky.status, MaintenanceOutboxEvent.Status.PENDING)
+            self.assertEqual(flaky.attempts, 1)
+            self.assertGreater(flaky.next_attempt_at, timezone.now())
+
+            # Make the retry due and let the endpoint recover
+            stub.failing.clear()
+            MaintenanceOutboxEvent.objects.filter(pk=flaky.pk).update(next_attempt_at=timezone.now())
+            self.assertEqual(dispatch_pending(), (1, 0))
+
+        self.assertEqual(len(stub.hits("/ok/")), 1)
+        self.assertEqual(len(stub.hits("/flaky/")), 2)
+
+    def test_gives_up_after_max_attempts(self):
+        with StubWebhookServer() as stub:
+            stub.failing.add("/down/")
+            self.approve([stub.url("/down/")])
+            with self.settings(MAINTENANCE_SUITE={"OUTBOX_AUTO_DISPATCH": False, "OUTBOX_MAX_ATTEMPTS": 1}):
+                self.assertEqual(dispatch_pending(), (1, 1))
+
+        failed = MaintenanceOutboxEvent.objects.get(target=stub.url("/down/"))
+        self.assertEqual(failed.status, MaintenanceOutboxEvent.Status.FAILED)
+        self.assertIn("500", failed.last_error)
@@ -0,0 +1,46 @@
+from django.core.exceptions import ValidationError
+from django.test import RequestFactory, SimpleTestCase
+
+from django_enterprise_maintenance_suite.policy import ReadOnlyPolicy, validate_rules
+
+
+class ValidateRulesTests(SimpleTestCase):
+    def test_rejects_malformed_rules(self):
+        for rules in (
+            [{"methods": "POST", "path": "^graphql/$"}],
+            [{"methods": ["POST", 1]}],
+            [{"methods": ["POST"], "prefix": 5}],
+            [{"methods": ["POST"], "path": ["^graphql/$"]}],
+            [{"methods": ["POST"], "headers": ["X-Op"]}],
+            [{"methods": ["POST"], "headers": {"X-Op": 1}}],
+        ):
+            with self.subTest(rules=rules), self.assertRaises(ValidationError):
+                validate_rules(rules)
+
+    def test_valid_rules_compile(self):
+        rules = [
+            {"methods": ["POST"], "path": "^graphql/$"},
+            {"methods": ["PUT"], "prefix": "/api/cache-warm", "headers": {"X-Op": "query"}},
+        ]
+        validate_rules(rules)
+        policy = ReadOnlyPolicy(rules=rules)
+        factory = RequestFactory()
+        self.assertFalse(policy.is_write(factory.post("/graphql/")))
+        self.assertFalse(policy.is_write(factory.put("/api/cache-warm/1", HTTP_X_OP="query")))
+        self.assertTrue(policy.is_write(factory.put("/api/cache-warm/1")))
+        self.assertTrue(policy.is_write(factory.post("/orders/")))
+
+    def test_rules_do_not_interfere(self):
+        # Same group names and numbered backreferences in separate rules
+        rules = [
+            {"methods": ["POST"], "path": r"^(?P<v>a+)/$"},
+            {"methods": ["POST"], "path": r"^(?P<v>c+)/$"},
+            {"methods": ["POST"], "path": r"^(b)\1/$"},
+        ]
+        validate_rules(rules)
+        policy = ReadOnlyPolicy(rules=rules)
+        factory = RequestFactory()
+        self.assertFalse(policy.is_write(factory.post("/aa/")))
+        self.assertFalse(policy.is_write(factory.post("/cc/")))
+        self.assertFalse(policy.is_write(factory.post("/bb/")))
+        self.assertTrue(policy.is_write(factory.post("/ab/")))
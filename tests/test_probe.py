@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from django_enterprise_maintenance_suite.drain import InFlightCounter
+from django_enterprise_maintenance_suite.models import MaintenanceState
+from django_enterprise_maintenance_suite.probe import MAINTENANCE_SNAPSHOT_KEY, cache_snapshot, probe
+
+
+class ProbeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create(username="ops")
+
+    def create_window(self, **kwargs):
+        return MaintenanceState.objects.create(
+            reason="Deploy",
+            created_by=self.user,
+            status=MaintenanceState.Status.APPROVED,
+            is_enabled=True,
+            **kwargs,
+        )
+
+    def test_operational(self):
+        data, exit_code = probe()
+        self.assertEqual((data["system_status"], exit_code), ("operational", 0))
+
+    def test_miss_reads_the_database_once(self):
+        window = self.create_window()
+        data, exit_code = probe()
+        self.assertEqual((data["window_id"], data["source"], exit_code), (window.pk, "db", 1))
+        with self.assertNumQueries(0):
+            data, _ = probe()
+        self.assertEqual(data["source"], "cache")
+
+    def test_miss_never_replaces_a_fresher_snapshot(self):
+        cache_snapshot(None)
+        self.create_window()
+        data, exit_code = probe()
+        self.assertEqual((data["system_status"], exit_code), ("operational", 0))
+        self.assertIs(cache.get(MAINTENANCE_SNAPSHOT_KEY), False)
+
+    def test_schedule_is_applied_to_the_snapshot(self):
+        self.create_window(start_time=timezone.now() + timedelta(hours=1))
+        data, exit_code = probe()
+        self.assertEqual((data["system_status"], exit_code), ("operational", 0))
+
+    def test_shadow_windows_are_not_reported(self):
+        self.create_window(is_shadow=True)
+        self.assertEqual(probe()[1], 0)
+
+    def test_draining(self):
+        with self.settings(MAINTENANCE_SUITE={"OUTBOX_AUTO_DISPATCH": False, "DRAIN_TIMEOUT": 30}):
+            window = self.create_window()
+            counter = InFlightCounter()
+            counter.watch(window.enabled_at + timedelta(seconds=30))
+            counter.increment()
+            data, exit_code = probe()
+            counter.decrement()
+        self.assertEqual((data["system_status"], data["in_flight"], exit_code), ("draining", 1, 1))
@@ -0,0 +1,32 @@
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from django_enterprise_maintenance_suite.services.reporting import split_by_day
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+class SplitByDayTests(SimpleTestCase):
+    def test_splits_on_local_midnight(self):
+        with timezone.override(NEW_YORK):
+            pieces = split_by_day(
+                datetime(2026, 1, 5, 22, 0, tzinfo=NEW_YORK),
+                datetime(2026, 1, 6, 1, 0, tzinfo=NEW_YORK),
+            )
+        self.assertEqual(pieces, [(date(2026, 1, 5), 7200), (date(2026, 1, 6), 3600)])
+
+    def test_dst_days_use_elapsed_time(self):
+        with timezone.override(NEW_YORK):
+            spring = split_by_day(
+                datetime(2026, 3, 8, tzinfo=NEW_YORK),
+                datetime(2026, 3, 9, tzinfo=NEW_YORK),
+            )
+            autumn = split_by_day(
+                datetime(2026, 11, 1, tzinfo=NEW_YORK),
+                datetime(2026, 11, 2, tzinfo=NEW_YORK),
+            )
+        self.assertEqual(spring, [(date(2026, 3, 8), 23 * 3600)])
+        self.assertEqual(autumn, [(date(2026, 11, 1), 25 * 3600)])
@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from django_enterprise_maintenance_suite.models import MaintenanceState
+from django_enterprise_maintenance_suite.probe import probe
+from django_enterprise_maintenance_suite.services.exceptions import InvalidTransitionError
+from django_enterprise_maintenance_suite.services.maintenance import MaintenanceService
+from django_enterprise_maintenance_suite.views import get_status_payload
+
+
+class SetRolloutTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="ops")
+        self.window = MaintenanceState.objects.create(reason="Migration", created_by=self.user)
+
+    def test_pending_window_can_start_low(self):
+        MaintenanceService.set_rollout(self.window, 5, user=self.user)
+        self.window.refresh_from_db()
+        self.assertEqual(self.window.rollout_percentage, 5)
+
+    def test_approved_window_is_raise_only(self):
+        MaintenanceService.set_rollout(self.window, 5, user=self.user)
+        with self.settings(MAINTENANCE_SUITE={"OUTBOX_AUTO_DISPATCH": False}):
+            MaintenanceService.approve(self.window, self.user)
+        MaintenanceService.set_rollout(self.window, 25, user=self.user)
+        with self.assertRaises(InvalidTransitionError):
+            MaintenanceService.set_rollout(self.window, 10, user=self.user)
+
+
+class PartialRolloutStatusTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.window = MaintenanceState.objects.create(
+            reason="Migration",
+            created_by=get_user_model().objects.create(username="ops"),
+            status=MaintenanceState.Status.APPROVED,
+            is_enabled=True,
+            rollout_percentage=5,
+        )
+
+    def test_status_reports_partial(self):
+        data, _ = get_status_payload()
+        self.assertEqual(data["system_status"], "partial")
+        self.assertEqual(data["maintenance_window"]["mode"], MaintenanceState.Mode.MAINTENANCE)
+        self.assertEqual(data["maintenance_window"]["rollout_percentage"], 5)
+
+    def test_probe_passes_at_partial_rollout(self):
+        data, exit_code = probe()
+        self.assertEqual((data["system_status"], data["rollout_percentage"], exit_code), ("partial", 5, 0))
+
+    def test_probe_fails_at_full_rollout(self):
+        self.window.rollout_percentage = 100
+        self.window.save()
+        data, exit_code = probe()
+        self.assertEqual((data["system_status"], exit_code), (MaintenanceState.Mode.MAINTENANCE, 1))
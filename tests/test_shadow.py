@@ -0,0 +1,49 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from django_enterprise_maintenance_suite.models import MaintenanceDowntimeRollup, MaintenanceState
+from django_enterprise_maintenance_suite.services.maintenance import MaintenanceService
+from django_enterprise_maintenance_suite.shadow import ShadowAggregator
+
+SUITE = {"OUTBOX_AUTO_DISPATCH": False, "SHADOW_FLUSH_INTERVAL": 0.05}
+
+
+class ShadowAggregatorTests(SimpleTestCase):
+    def test_flushes_without_further_traffic(self):
+        flushed = threading.Event()
+        stored = []
+
+        def store_counts(counts):
+            stored.append(counts)
+            flushed.set()
+
+        aggregator = ShadowAggregator()
+        with self.settings(MAINTENANCE_SUITE=SUITE), mock.patch(
+            "django_enterprise_maintenance_suite.services.shadow.store_counts", store_counts
+        ):
+            aggregator.record(7, "/orders/42/", "POST")
+            aggregator.record(7, "/orders/43/", "POST")
+            self.assertTrue(flushed.wait(timeout=2))
+
+        self.assertEqual(stored, [{(7, "/orders", "POST"): 2}])
+
+
+class ShadowDowntimeTests(TestCase):
+    def test_closing_a_shadow_window_records_no_downtime(self):
+        user = get_user_model().objects.create(username="ops")
+        window = MaintenanceState.objects.create(
+            reason="Dry run",
+            created_by=user,
+            is_shadow=True,
+            start_time=timezone.now() - timedelta(hours=1),
+        )
+        with self.settings(MAINTENANCE_SUITE=SUITE):
+            MaintenanceService.approve(window, user)
+            MaintenanceService.complete(window, user)
+
+        self.assertFalse(MaintenanceDowntimeRollup.objects.exists())
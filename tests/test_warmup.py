@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase
+
+from django_enterprise_maintenance_suite.backends import DefaultMaintenanceBackend
+from django_enterprise_maintenance_suite.models import MaintenanceIgnoreURL, MaintenanceState
+from django_enterprise_maintenance_suite.warmup import get_setting, load_backend_class, validate_settings
+
+
+class ValidateSettingsTests(SimpleTestCase):
+    def assertInvalid(self, suite, message):
+        with self.settings(MAINTENANCE_SUITE=suite):
+            with self.assertRaisesMessage(ImproperlyConfigured, message):
+                validate_settings()
+
+    def test_invalid_pattern(self):
+        self.assertInvalid({"IGNORE_URL_PATTERNS": ["^api/("]}, "IGNORE_URL_PATTERNS")
+
+    def test_negative_number(self):
+        self.assertInvalid({"DRAIN_TIMEOUT": -1}, "DRAIN_TIMEOUT")
+
+    def test_invalid_policy(self):
+        self.assertInvalid({"READ_ONLY_POLICY": [{"methods": "POST"}]}, "READ_ONLY_POLICY")
+
+    def test_unknown_backend(self):
+        with self.settings(MAINTENANCE_SUITE={"BACKEND": "tests.missing.Backend"}):
+            with self.assertRaisesMessage(ImproperlyConfigured, "BACKEND"):
+                load_backend_class()
+
+    def test_get_setting(self):
+        with self.settings(MAINTENANCE_SUITE={"DRAIN_TIMEOUT": 5}):
+            self.assertEqual(get_setting("DRAIN_TIMEOUT", 0), 5)
+            self.assertEqual(get_setting("FEED_HEARTBEAT", 15), 15)
+
+
+class CompiledExemptionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.window = MaintenanceState.objects.create(
+            reason="Deploy",
+            created_by=get_user_model().objects.create(username="ops"),
+            status=MaintenanceState.Status.APPROVED,
+            is_enabled=True,
+        )
+        MaintenanceIgnoreURL.objects.create(maintenance_window=self.window, pattern=r"^health/")
+        self.backend = DefaultMaintenanceBackend()
+
+    def test_exemptions_are_compiled_once_per_version(self):
+        state = MaintenanceState.objects.get(pk=self.window.pk)
+        state.version
+        [pattern] = self.backend.get_exemptions(state)
+        self.assertTrue(pattern.match("health/live"))
+        with self.assertNumQueries(0):
+            self.backend.get_exemptions(state)
+
+    def test_new_exemption_is_picked_up(self):
+        self.backend.get_exemptions(MaintenanceState.objects.get(pk=self.window.pk))
+        MaintenanceIgnoreURL.objects.create(maintenance_window=self.window, pattern=r"^ready/")
+        patterns = self.backend.get_exemptions(MaintenanceState.objects.get(pk=self.window.pk))
+        self.assertEqual(len(patterns), 2)
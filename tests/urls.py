@@ -0,0 +1,12 @@
+from django.http import HttpResponse
+from django.urls import include, path
+
+
+def hello(request):
+    return HttpResponse("hello")
+
+
+urlpatterns = [
+    path("", include("django_enterprise_maintenance_suite.urls")),
+    path("hello/", hello),
+]